@@ -0,0 +1,84 @@
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import extract_record  # noqa: E402
+from synthetic import make_adversarial_profiles, make_profiles  # noqa: E402
+
+
+def legacy_extract(follower, account):
+    # extract_data as it was before the single-pass engine, kept for comparison
+    bio_url = f"{follower.biography} {follower.external_url or ''}"
+    emails = [e for e in re.findall(r'[\w.+-]+@[\w-]+\.[\w.-]+', bio_url) if re.match(r'^[\w.+-]+@[\w-]+\.[\w.-]+$', e)]
+    emails = emails[:3] + [""] * (3 - len(emails[:3]))
+    phones = [re.sub(r'[^\d+]', '', p) for p in re.findall(r'(?:\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}', bio_url)]
+    phones = [p for p in phones if re.match(r'^\+?\d{7,15}$', p)][:3]
+    phones += [""] * (3 - len(phones))
+    name_parts = follower.full_name.split()
+    fn = name_parts[0] if name_parts else ""
+    ln = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
+    location_match = re.search(r'[📍📌](.*?)(?=$|\n)', follower.biography)
+    location = location_match.group(1).strip() if location_match else bio_url
+    parts = location.split(',') if location else []
+    ct = parts[0].strip() if parts else ""
+    st = parts[1].strip() if len(parts) > 1 else ""
+    country = parts[2].strip() if len(parts) > 2 else ""
+    zip_match = re.search(r'\b\d{5}(?:-\d{4})?\b', follower.biography)
+    zip_code = zip_match.group(0) if zip_match else ""
+    age_match = re.search(r'\b(\d{1,2})\s*(?:yo|years? old)\b', follower.biography, re.I)
+    age = age_match.group(1) if age_match else ""
+    doby = datetime.now().year - int(age) if age else ""
+    gen = "F" if "she" in follower.biography.lower() else "M" if "he" in follower.biography.lower() else ""
+    uid = hash(follower.username) % 1000000000
+    value = 1.0 + (0.5 if follower.is_business_account else 0) + min(follower.followers / 10000, 1.0)
+    return {
+        'username': follower.username, 'account': account, 'email': emails[0], 'email.1': emails[1], 'email.2': emails[2],
+        'phone': phones[0], 'phone.1': phones[1], 'phone.2': phones[2], 'madid': "",
+        'fn': fn, 'ln': ln, 'zip': zip_code, 'ct': ct, 'st': st, 'country': country,
+        'location': location, 'is_business': str(follower.is_business_account),
+        'is_verified': str(follower.is_verified), 'dob': "", 'doby': doby, 'gen': gen,
+        'age': age, 'uid': uid, 'value': round(value, 2), 'followers_count': follower.followers
+    }
+
+
+def engine_extract(follower, account):
+    return extract_record(follower.username, follower.biography, follower.external_url, follower.full_name,
+                          follower.followers, follower.is_business_account, follower.is_verified, account)
+
+
+def per_record_us(fn, profiles, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for p in profiles:
+            fn(p, "bench")
+        best = min(best, time.perf_counter() - start)
+    return best / len(profiles) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-record cost of extract_data before and after the single-pass engine')
+    parser.add_argument('-n', type=int, default=50000, help='Synthetic profiles to extract')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    profiles = make_profiles(args.n)
+    # uid moved from the per-process hash() to crc32 and accounts postdates the legacy extractor,
+    # so both are left out of the parity check
+    strip_uid = lambda record: {k: v for k, v in record.items() if k not in ('uid', 'accounts')}
+    mismatches = sum(strip_uid(legacy_extract(p, "bench")) != strip_uid(engine_extract(p, "bench")) for p in profiles)
+    adversarial = sum(strip_uid(legacy_extract(p, "bench")) != strip_uid(engine_extract(p, "bench"))
+                      for p in make_adversarial_profiles(args.n))
+    before = per_record_us(legacy_extract, profiles, args.repeat)
+    after = per_record_us(engine_extract, profiles, args.repeat)
+    print(f"records={args.n} legacy={before:.2f}us/record engine={after:.2f}us/record "
+          f"speedup={before / after:.2f}x mismatches={mismatches} adversarial_mismatches={adversarial}")
+
+
+if __name__ == "__main__":
+    main()
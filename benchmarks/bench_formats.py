@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import COLUMNS, RecordStore, ShardedSink, extract_record, write_arrow  # noqa: E402
+from synthetic import make_profiles  # noqa: E402
+
+RAW_FIELDS = ['username', 'biography', 'external_url', 'full_name', 'followers', 'is_business_account', 'is_verified']
+READERS = {
+    'csv': lambda path, columns: pd.read_csv(path, usecols=columns, keep_default_na=False),
+    'parquet': lambda path, columns: pd.read_parquet(path, columns=columns),
+    'feather': lambda path, columns: pd.read_feather(path, columns=columns),
+}
+
+
+
+def read_shards(manifest_path, columns, workers):
+    # Shards are independent files, so they load in parallel; input_stream decompresses by extension
+    with open(manifest_path) as f:
+        shards = [os.path.join(os.path.dirname(manifest_path), s['file']) for s in json.load(f)['shards']]
+    with ThreadPoolExecutor(workers) as executor:
+        frames = executor.map(lambda path: pd.read_csv(pa.input_stream(path), usecols=columns, keep_default_na=False), shards)
+        return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Size and load time of the csv output vs typed parquet/feather')
+    parser.add_argument('-n', type=int, default=200000, help='Synthetic profiles')
+    parser.add_argument('--subset', nargs='+', default=['username', 'value', 'followers_count'],
+                        help='Columns for the column-subset read')
+    parser.add_argument('--shard-rows', type=int, default=50000, help='Rows per compressed csv shard')
+    parser.add_argument('--workers', type=int, default=4, help='Threads loading shards')
+    args = parser.parse_args()
+
+    records = RecordStore(COLUMNS)
+    records.extend(extract_record(*(getattr(p, f) for f in RAW_FIELDS), f"account{p.userid % 5}")
+                   for p in make_profiles(args.n))
+    with tempfile.TemporaryDirectory() as tmp:
+        for format, read in READERS.items():
+            path = os.path.join(tmp, f"followers.{format}")
+            start = time.perf_counter()
+            if format == 'csv':
+                records.to_frame().to_csv(path, index=False)
+            else:
+                write_arrow(records, COLUMNS, path, format)
+            write = time.perf_counter() - start
+            start = time.perf_counter()
+            read(path, None)
+            load = time.perf_counter() - start
+            start = time.perf_counter()
+            read(path, args.subset)
+            subset = time.perf_counter() - start
+            print(f"{format:8} size={os.path.getsize(path) / 1e6:.1f}MB write={write:.2f}s "
+                  f"load={load:.3f}s subset_load={subset:.3f}s")
+        for compression in ('gzip', 'zstd'):
+            start = time.perf_counter()
+            sink = ShardedSink(os.path.join(tmp, "shards.csv"), COLUMNS, shard_rows=args.shard_rows, compression=compression)
+            sink.write_store(records)
+            sink.close()
+            write = time.perf_counter() - start
+            size = sum(shard['bytes'] for shard in sink.shards)
+            start = time.perf_counter()
+            read_shards(sink.manifest_path, None, args.workers)
+            load = time.perf_counter() - start
+            start = time.perf_counter()
+            read_shards(sink.manifest_path, args.subset, args.workers)
+            subset = time.perf_counter() - start
+            print(f"csv.{compression:4} size={size / 1e6:.1f}MB write={write:.2f}s load={load:.3f}s "
+                  f"subset_load={subset:.3f}s shards={len(sink.shards)}")
+
+
+if __name__ == "__main__":
+    main()
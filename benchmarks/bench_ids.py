@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import IdIndex  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='processed_ids as a JSON list vs the binary IdIndex')
+    parser.add_argument('-n', type=int, default=5000000, help='Processed follower ids')
+    parser.add_argument('--batch', type=int, default=1000, help='Ids per membership batch')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ids = rng.choice(2 ** 40, size=args.n, replace=False).tolist()
+    probe = rng.choice(2 ** 40, size=args.batch).tolist()[:args.batch // 2] + ids[:args.batch // 2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'processed.json')
+        _, json_save = timed(lambda: json.dump(list(set(ids)), open(path, 'w')))
+        loaded, json_load = timed(lambda: set(json.load(open(path))))
+        _, set_probe = timed(lambda: [i in loaded for i in probe])
+        print(f"json   size={os.path.getsize(path) / 1e6:.1f}MB save={json_save:.3f}s load={json_load:.3f}s "
+              f"probe={set_probe * 1e3:.3f}ms")
+
+        path = os.path.join(tmp, 'processed.ids')
+        index = IdIndex.from_ids(ids, path)
+        _, index_save = timed(index.save)
+        index, index_load = timed(lambda: IdIndex.load(path))
+        _, index_probe = timed(lambda: index.contains_many(probe))
+        print(f"idindex size={os.path.getsize(path) / 1e6:.1f}MB save={index_save:.3f}s load={index_load:.3f}s "
+              f"probe={index_probe * 1e3:.3f}ms hits={int(index.contains_many(probe).sum())}")
+
+
+if __name__ == "__main__":
+    main()
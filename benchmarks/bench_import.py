@@ -0,0 +1,55 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ['pandas', 'numpy', 'pyarrow', 'instaloader', 'requests', 'tkinter', 'cryptography', 'smtplib', 'schedule', 'tqdm']
+CASES = {
+    'help': [sys.executable, '-m', 'instagram_scraper', '--help'],
+    'package': [sys.executable, '-c', 'import instagram_scraper'],
+    'pipeline': [sys.executable, '-c', 'import instagram_scraper.scraper'],
+}
+
+
+def wall_ms(cmd, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def import_ms(cmd):
+    # Cumulative -X importtime of the package's own top-level imports, without interpreter startup
+    out = subprocess.run([cmd[0], '-X', 'importtime', *cmd[1:]], cwd=ROOT, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.PIPE, text=True, check=True).stderr
+    total, loaded = 0, set()
+    for line in out.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        module = name.strip()
+        loaded.add(module.split('.')[0])
+        if module.startswith('instagram_scraper') and name == f" {module}":
+            total += int(cumulative)
+    return total / 1e3, sorted(m for m in HEAVY if m in loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import time of the CLI and the pipeline modules')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    args = parser.parse_args()
+
+    baseline = wall_ms([sys.executable, '-c', 'pass'], args.repeat)
+    for case, cmd in CASES.items():
+        total = wall_ms(cmd, args.repeat)
+        imports, heavy = import_ms(cmd)
+        print(f"{case:<9} wall={total:.1f}ms over_interpreter={total - baseline:.1f}ms "
+              f"package_imports={imports:.1f}ms heavy={','.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import COLUMNS, RecordStore, extract_record  # noqa: E402
+from synthetic import make_profiles  # noqa: E402
+
+RAW_FIELDS = ['username', 'biography', 'external_url', 'full_name', 'followers', 'is_business_account', 'is_verified']
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+
+def fill(raw, accounts):
+    store = RecordStore(COLUMNS)
+    for i, r in enumerate(raw):
+        store.append(extract_record(*r, f"account{i % accounts}"))
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory held by followers_data: list of dicts vs RecordStore')
+    parser.add_argument('-n', type=int, default=200000, help='Synthetic profiles')
+    parser.add_argument('--accounts', type=int, default=5, help='Distinct scraped accounts')
+    args = parser.parse_args()
+
+    raw = [tuple(getattr(p, f) for f in RAW_FIELDS) for p in make_profiles(args.n)]
+
+    # Each build extracts its own records so neither side shares string objects with the other
+    dicts, dict_bytes = measure(lambda: [extract_record(*r, f"account{i % args.accounts}") for i, r in enumerate(raw)])
+    del dicts
+    store, store_bytes = measure(lambda: fill(raw, args.accounts))
+    print(f"records={args.n} dicts={dict_bytes / 1e6:.1f}MB ({dict_bytes / args.n:.0f}B/row) "
+          f"store={store_bytes / 1e6:.1f}MB ({store_bytes / args.n:.0f}B/row) ratio={dict_bytes / store_bytes:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper.preview import TextPreview  # noqa: E402
+
+COLUMNS = ['username', 'biography', 'value']
+
+
+def make_rows(n, huge):
+    # A few biographies are longer than TextPreview.CHUNK, with newlines and quotes in the CSV case
+    rng = random.Random(0)
+    rows = [[f"user{i}", f"bio {i} \"quoted\"\nsecond line" if i % 7 == 0 else f"bio {i}", str(rng.random())]
+            for i in range(n)]
+    for i in rng.sample(range(n), huge):
+        rows[i][1] = ("x" * 4093 + "\n\"q\"") * (TextPreview.CHUNK // 2048)
+    return rows
+
+
+def write(path, format, rows):
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        if format == "csv":
+            csv.writer(f).writerows(rows)
+        else:
+            f.writelines(json.dumps(dict(zip(COLUMNS, row))) + '\n' for row in rows)
+
+
+def check(format, rows, tmp):
+    path = os.path.join(tmp, f"followers.{format}")
+    half = len(rows) // 2
+    write(path, format, [COLUMNS] if format == "csv" else [])
+    write(path, format, rows[:half])
+    preview = TextPreview(path, format, COLUMNS)
+    start = time.perf_counter()
+    refreshes = 1
+    while preview.refresh():
+        refreshes += 1
+    # The rest is appended while the preview is open, as when streaming
+    write(path, format, rows[half:])
+    while preview.refresh():
+        refreshes += 1
+    elapsed = time.perf_counter() - start
+    mismatches = int(len(preview) != len(rows))
+    for begin in range(0, len(rows), 97):
+        mismatches += preview.rows(begin, 50) != rows[begin:begin + 50]
+    preview.close()
+    print(f"{format:5} rows={len(preview)} size={os.path.getsize(path) / 1e6:.1f}MB index={elapsed:.3f}s "
+          f"refreshes={refreshes} mismatches={mismatches}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TextPreview indexing and paging, with records longer than CHUNK')
+    parser.add_argument('-n', type=int, default=20000, help='Rows')
+    parser.add_argument('--huge', type=int, default=3, help='Rows with a biography longer than CHUNK')
+    args = parser.parse_args()
+
+    rows = make_rows(args.n, args.huge)
+    with tempfile.TemporaryDirectory() as tmp:
+        mismatches = sum(check(format, rows, tmp) for format in ("csv", "jsonl"))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import COLUMNS, RecordStore, SnapshotStore, diff_snapshots  # noqa: E402
+from synthetic import PLACES  # noqa: E402
+
+
+def make_store(ids, changed=()):
+    store = RecordStore(COLUMNS)
+    for uid in ids:
+        account = 'alpha' if uid % 3 else 'beta'
+        store.append({'username': f"user_{uid}", 'account': account, 'accounts': account,
+                      'location': PLACES[uid % len(PLACES)], 'is_business': uid % 4 == 0,
+                      'followers_count': uid % 5000 + (1 if uid in changed else 0)}, uid)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Snapshot write and partitioned diff of two runs')
+    parser.add_argument('-n', type=int, default=1000000, help='Followers per snapshot')
+    parser.add_argument('--churn', type=float, default=0.01, help='Share of followers added, removed and changed each')
+    parser.add_argument('--partitions', type=int, default=SnapshotStore.PARTITIONS, help='Hash partitions per snapshot')
+    args = parser.parse_args()
+
+    churn = int(args.n * args.churn)
+    old_ids = range(args.n)
+    new_ids = range(churn, args.n + churn)
+    changed = set(range(churn, 2 * churn))
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshots = SnapshotStore(tmp, args.partitions)
+        paths = []
+        for store in (make_store(old_ids), make_store(new_ids, changed)):
+            start = time.perf_counter()
+            paths.append(snapshots.write(store))
+            elapsed = time.perf_counter() - start
+            size = sum(os.path.getsize(os.path.join(paths[-1], f)) for f in os.listdir(paths[-1]))
+            print(f"write rows={len(store)} elapsed={elapsed:.2f}s size={size / 1e6:.1f}MB "
+                  f"throughput={len(store) / elapsed:.0f} rows/s")
+            del store
+
+        counts = {'added': 0, 'removed': 0, 'changed': 0}
+        start = time.perf_counter()
+        for change, *_ in diff_snapshots(*paths):
+            counts[change] += 1
+        elapsed = time.perf_counter() - start
+        # Peak memory from a second pass, since tracing slows the diff several times over
+        tracemalloc.start()
+        for _ in diff_snapshots(*paths):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"diff elapsed={elapsed:.2f}s peak={peak / 1e6:.1f}MB {counts} "
+              f"expected={{'added': {churn}, 'removed': {churn}, 'changed': {churn}}}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import FakeInstaloader, IdIndex, InstagramFollowerScraper, RecordStore  # noqa: E402
+from synthetic import write_fixture  # noqa: E402
+
+
+def make_scraper(args, fixture):
+    db_file = "followers.db" if args.format == "sqlite" else None
+    scraper = InstagramFollowerScraper(
+        args.accounts, checkpoint_mode=args.checkpoint_mode, state_db="run_state.db" if args.state_db else None,
+        cache_backend=args.cache_backend, extract_workers=args.workers, output_format=args.format, db_file=db_file, stream=args.stream,
+        shard_rows=args.shard_rows, compression=args.compression, source=FakeInstaloader(fixture, args.latency))
+    return scraper
+
+
+def scrape(scraper, args):
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        scraper.scrape_followers(min_followers=args.min_followers, business_only=args.business_only)
+
+
+def interrupt_after(scraper, count):
+    # What a Ctrl+C followed by quitting leaves behind: a forced checkpoint, then the run stops
+    # at the next batch boundary with the rest of that batch unsaved
+    update_stats = scraper.update_stats
+
+    def hook(data):
+        update_stats(data)
+        if scraper.stats['processed'] == count:
+            scraper.save_checkpoint(force=True)
+            scraper.cache.flush()
+            scraper.stopped = True
+    scraper.update_stats = hook
+
+
+def downgrade_checkpoint(scraper):
+    # Rewrites a full-mode checkpoint in the format written before the columnar store: bare records
+    # without accounts or follower ids, a flat processed_ids list and no id index beside it
+    with open(scraper.checkpoint_file) as f:
+        checkpoint = json.load(f)
+    records = RecordStore.from_checkpoint(scraper.columns, checkpoint).records()
+    index = IdIndex.load(scraper.id_index_file)
+    legacy = {'followers_data': [{k: v for k, v in r.items() if k != 'accounts'} for r in records],
+              'processed_ids': [*index.base.tolist(), *index.pending], 'resume_id': checkpoint['resume_id']}
+    with open(scraper.checkpoint_file, 'w') as f:
+        json.dump(legacy, f)
+    for path in (index.path, index.log_file):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def first_record_after(scraper, start):
+    # Followers stream in batches, so the first record lands long before enumeration finishes
+    update_stats = scraper.update_stats
+    first = []
+
+    def hook(data):
+        if not first:
+            first.append(time.perf_counter() - start)
+        update_stats(data)
+    scraper.update_stats = hook
+    return first
+
+
+def shard_contents(manifest_path):
+    # Decompressed shards in manifest order, after checking each one against its checksum
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    assert manifest['complete'], f"{manifest_path} is incomplete"
+    for shard in manifest['shards']:
+        path = os.path.join(os.path.dirname(manifest_path), shard['file'])
+        with open(path, 'rb') as f:
+            data = f.read()
+        assert hashlib.sha256(data).hexdigest() == shard['sha256'], f"{path} does not match its checksum"
+        if manifest['compression'] == "gzip":
+            data = gzip.decompress(data)
+        elif manifest['compression'] == "zstd":
+            import pyarrow as pa
+            data = pa.input_stream(path, compression='zstd').read()
+        yield data
+
+
+def output_digest(scraper, args):
+    path = scraper.output_path(args.format, scraper.db_file)
+    digest = hashlib.sha256()
+    if args.shard_rows and args.format in ("csv", "jsonl"):
+        for data in shard_contents(f"{path}.manifest.json"):
+            digest.update(data)
+    elif args.format == "sqlite":
+        with sqlite3.connect(path) as conn:
+            for row in conn.execute("SELECT * FROM followers ORDER BY account, username"):
+                digest.update(repr(row).encode('utf-8'))
+    else:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def run_in(workdir, fn):
+    cwd = os.getcwd()
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)  # every run keeps its checkpoint, cache and output files apart
+    try:
+        return fn()
+    finally:
+        os.chdir(cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline end-to-end run on FakeInstaloader, checking that pause/resume output matches')
+    parser.add_argument('-n', type=int, default=20000, help='Followers per account')
+    parser.add_argument('--accounts', nargs='+', default=['alpha', 'beta'], help='Fake accounts to scrape')
+    parser.add_argument('--overlap', type=float, default=0.2, help='Share of followers common to all accounts')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated seconds per page of 50 followers')
+    parser.add_argument('--interrupt', type=float, default=0.4, help='Fraction of the run after which to stop and resume')
+    parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'sqlite', 'parquet', 'feather'], default='csv')
+    parser.add_argument('--stream', action='store_true', help='Stream output during the run')
+    parser.add_argument('--checkpoint-mode', choices=['full', 'journal'], default='full')
+    parser.add_argument('--state-db', action='store_true', help='Keep run state in SQLite')
+    parser.add_argument('--cache-backend', choices=['sqlite', 'gzip'], default='sqlite', help='Profile cache backend')
+    parser.add_argument('--workers', type=int, default=0, help='Extraction processes (0 = in the I/O threads)')
+    parser.add_argument('--min-followers', type=int, help='Filter applied during the run')
+    parser.add_argument('--business-only', action='store_true', help='Filter applied during the run')
+    parser.add_argument('--fixture', help='Use this fixture instead of generating one')
+    parser.add_argument('--shard-rows', type=int, help='Write csv/jsonl output as shards of this many rows')
+    parser.add_argument('--compression', choices=['gzip', 'zstd', 'none'], default='gzip', help='Compression of output shards')
+    parser.add_argument('--lose-index', action='store_true', help='Never save the id index before the interruption')
+    parser.add_argument('--legacy-checkpoint', action='store_true',
+                        help='Resume from the interrupted checkpoint rewritten in the pre-columnar format (full mode)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        fixture = os.path.abspath(args.fixture) if args.fixture else \
+            write_fixture(os.path.join(workdir, "fixture.json"), args.accounts, args.n, overlap=args.overlap)
+
+        def straight():
+            scraper = make_scraper(args, fixture)
+            scraper.start_new = True
+            start = time.perf_counter()
+            first = first_record_after(scraper, start)
+            scrape(scraper, args)
+            return scraper, time.perf_counter() - start, first[0] if first else float('nan')
+
+        scraper, elapsed, first = run_in(os.path.join(workdir, "straight"), straight)
+        total = len(scraper.followers_data)
+        print(f"records={total} elapsed={elapsed:.2f}s throughput={total / elapsed:.0f} records/s "
+              f"first_record={first * 1e3:.1f}ms")
+        for stage, entry in sorted(scraper.metrics.summary()['stages'].items(), key=lambda s: -s[1]['total_seconds']):
+            print(f"  {stage:<20} count={entry['count']:<8} total={entry['total_seconds']:.3f}s "
+                  f"mean={entry['mean_seconds'] * 1e6:.1f}us")
+        expected = run_in(os.path.join(workdir, "straight"), lambda: output_digest(scraper, args))
+
+        def interrupted():
+            first = make_scraper(args, fixture)
+            first.start_new = True
+            if args.lose_index:
+                # As if every crash landed between a checkpoint and its id index save
+                first.processed_ids.save = lambda: None
+            interrupt_after(first, max(1, int(total * args.interrupt)))
+            scrape(first, args)
+            if args.legacy_checkpoint:
+                downgrade_checkpoint(first)
+            resumed = make_scraper(args, fixture)
+            resumed.start_new = False
+            scrape(resumed, args)
+            if args.legacy_checkpoint:
+                with open(resumed.checkpoint_file) as f:
+                    assert '__follower_id__' in json.load(f)['followers_columns'], "follower ids were not rebuilt"
+                assert not resumed.followers_data.unlinked, "legacy rows left without follower ids"
+            return len(first.followers_data), resumed, output_digest(resumed, args)
+
+        stopped_at, resumed, actual = run_in(os.path.join(workdir, "resumed"), interrupted)
+        identical = actual == expected
+        print(f"stopped_at={stopped_at} resumed_records={len(resumed.followers_data)} identical={identical}")
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
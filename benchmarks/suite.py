@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instagram_scraper import InstagramFollowerScraper  # noqa: E402
+from synthetic import make_profiles  # noqa: E402
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+FORMATS = ["csv", "json", "jsonl", "sqlite", "parquet", "feather"]
+CHECKPOINT_MODES = ["full", "journal", "state"]
+
+
+def make_scraper(workdir, n, cache_backend, **kwargs):
+    # No proxies and no login, so constructing the scraper never touches the network. A name per
+    # size keeps the cache file of one size from warming the next.
+    return InstagramFollowerScraper(
+        [f"bench_{n}"], output_file=os.path.join(workdir, f"bench_{n}.csv"),
+        checkpoint_file=os.path.join(workdir, f"bench_{n}_{kwargs.get('checkpoint_mode', 'full')}.json"),
+        extract_workers=0, cache_size=n, cache_backend=cache_backend, **kwargs)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def result(seconds, n):
+    return {'seconds': round(seconds, 6), 'per_record_us': round(seconds / n * 1e6, 4), 'records': n}
+
+
+def bench_size(profiles, workdir, formats, modes, cache_backend):
+    n = len(profiles)
+    results = {}
+    scraper = make_scraper(workdir, n, cache_backend)
+
+    start = time.perf_counter()
+    records = [scraper.extract_data(p, "bench") for p in profiles]
+    results['extract_data'] = result(time.perf_counter() - start, n)
+
+    filters = (None, False, False, False, None)
+    start = time.perf_counter()
+    for p in profiles:
+        scraper.process_follower(p, "bench", *filters)
+    results['process_follower_cold'] = result(time.perf_counter() - start, n)
+    start = time.perf_counter()
+    for p in profiles:
+        scraper.process_follower(p, "bench", *filters)
+    results['process_follower_warm'] = result(time.perf_counter() - start, n)
+
+    for mode in modes:
+        state_db = os.path.join(workdir, f"bench_{n}_state.db") if mode == "state" else None
+        store = make_scraper(workdir, n, cache_backend, checkpoint_mode=mode, state_db=state_db)
+        for p, data in zip(profiles, records):
+            data = dict(data, accounts=data['account'])
+            store.record_follower(p.userid, data)
+        results[f'save_checkpoint_{mode}'] = result(timed(store.save_checkpoint, None, True), n)
+        results[f'load_checkpoint_{mode}'] = result(timed(store.load_checkpoint), n)
+        if mode == "full":
+            scraper = store
+    scraper.analytics.reset()
+    scraper.analytics.add_store(scraper.followers_data)
+
+    for fmt in formats:
+        db_file = os.path.join(workdir, f"bench_{n}.db") if fmt == "sqlite" else None
+        results[f'save_results_{fmt}'] = result(timed(scraper.save_results, fmt, None, db_file), n)
+    results['generate_analytics'] = result(timed(scraper.generate_analytics), n)
+    return results
+
+
+def compare(current, baseline, threshold):
+    regressions = []
+    for size, benches in current['results'].items():
+        for name, stats in benches.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if not before or not before['seconds']:
+                continue
+            ratio = stats['seconds'] / before['seconds']
+            flag = "REGRESSION" if ratio > 1 + threshold else ""
+            print(f"{size:>8} {name:<28} {before['seconds']:>10.4f}s -> {stats['seconds']:>10.4f}s {ratio:>6.2f}x {flag}")
+            if flag:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark suite over synthetic followers')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Follower counts to benchmark')
+    parser.add_argument('--formats', nargs='+', default=FORMATS, choices=FORMATS, help='save_results formats to time')
+    parser.add_argument('--checkpoint-modes', nargs='+', default=CHECKPOINT_MODES, choices=CHECKPOINT_MODES,
+                        help='Checkpoint modes to time save/load for')
+    # SQLite is the scraper's default backend. The gzip backend appends each flush but keeps every
+    # entry in memory, on top of the profiles, which the 1M size cannot spare on most machines
+    parser.add_argument('--cache-backend', choices=['sqlite', 'gzip'], default='sqlite',
+                        help='Profile cache backend used by process_follower')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic generator')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Baseline JSON from an earlier --output run')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Slowdown ratio above baseline reported as a regression (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cache_backend': args.cache_backend,
+        'results': {},
+    }
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # the scraper writes its log and cache next to the working directory
+        try:
+            for n in args.sizes:
+                profiles = make_profiles(n, args.seed)
+                report['results'][str(n)] = bench_size(profiles, workdir, args.formats, args.checkpoint_modes,
+                                                        args.cache_backend)
+                del profiles
+                for name, stats in report['results'][str(n)].items():
+                    print(f"{n:>8} {name:<28} {stats['seconds']:>10.4f}s {stats['per_record_us']:>10.2f}us/record")
+        finally:
+            os.chdir(cwd)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        print(f"regressions={len(regressions)} threshold={args.threshold:.0%}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
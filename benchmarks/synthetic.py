@@ -0,0 +1,92 @@
+import json
+import random
+from types import SimpleNamespace
+
+FIRST_NAMES = ["Jane", "John", "Maria", "Ahmed", "Li", "Sofia", "Liam", "Ava", "Noah", "Emma"]
+LAST_NAMES = ["Doe", "Smith", "Garcia", "Khan", "Wang", "Rossi", "Brown", "Silva", "Kim", "Nguyen"]
+PLACES = ["Austin, TX, USA", "Dhaka, Dhaka Division, Bangladesh", "Paris, Ile-de-France, France",
+          "Toronto, ON, Canada", "Lagos", "Berlin, Germany"]
+BIO_SNIPPETS = ["coffee lover", "she/her", "he/him", "photographer", "founder @startup", "travel & food",
+                "DM for collabs", "runner", "artist", "just vibes"]
+
+
+def make_profile(i, rng=random):
+    parts = rng.sample(BIO_SNIPPETS, rng.randint(1, 3))
+    if rng.random() < 0.4:
+        parts.insert(0, f"{rng.choice(['📍', '📌'])} {rng.choice(PLACES)}\n")
+    if rng.random() < 0.3:
+        parts.append(f"{rng.randint(16, 60)} {rng.choice(['yo', 'years old', 'year old'])}")
+    if rng.random() < 0.35:
+        parts.append(f"{rng.choice(FIRST_NAMES).lower()}{i}@{rng.choice(['gmail.com', 'mail.co.uk', 'biz.io'])}")
+    if rng.random() < 0.2:
+        parts.append(rng.choice([f"+1 512-555-{i % 10000:04d}", f"(212) 555-{i % 10000:04d}", f"0171{i % 1000000:06d}"]))
+    if rng.random() < 0.2:
+        parts.append(f"{rng.randint(10000, 99999)}")
+    followers = int(rng.paretovariate(1.2) * 50)
+    return SimpleNamespace(
+        userid=10 ** 9 + i,
+        username=f"user_{i}",
+        biography=" ".join(parts),
+        external_url=rng.choice([None, None, f"https://link.example/{i}", f"https://shop.example/contact?mail=hi{i}@shop.example"]),
+        full_name=rng.choice(["", f"{rng.choice(FIRST_NAMES)}", f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"]),
+        followers=followers,
+        is_business_account=rng.random() < 0.25,
+        is_verified=rng.random() < 0.03,
+    )
+
+
+def make_profiles(n, seed=0):
+    rng = random.Random(seed)
+    return [make_profile(i, rng) for i in range(n)]
+
+
+# Bios whose fields touch or overlap, where a scan that consumes one field can hide another
+ADJACENT_BIOS = ["orders: 10001@shop.com", "Austin TX 78701 5125551234", "78701-1234 5125551234",
+                 "call 512555123412345", "21yo 10001", "10001 21 years old", "+44 20 7946 0958 90210",
+                 "(212)555-0100x10001", "a12345@b.co 12345", "bio 12345-6789@mail.com", "30yo@x.io"]
+TOKENS = ["1", "12", "123", "1234", "12345", "123456", "5125551234", "12345-6789", "+1", "+44", "(212)", "555-0100",
+          "@", "shop.com", "mail.co.uk", "a.b", "_", "-", ".", "yo", "YO", "years old", "year old", "TX",
+          "📍", "📌", ",", "\n", "é", "٣", "she", "he"]
+
+
+def make_adversarial_profile(i, rng=random):
+    if rng.random() < 0.05:
+        bio = rng.choice(ADJACENT_BIOS)
+    else:
+        bio = "".join(rng.choice(TOKENS) + rng.choice(["", "", " "]) for _ in range(rng.randint(1, 12)))
+    return SimpleNamespace(
+        userid=10 ** 9 + i,
+        username=f"user_{i}",
+        biography=bio,
+        external_url=rng.choice([None, f"https://x.example/{rng.choice(TOKENS)}{rng.choice(TOKENS)}"]),
+        full_name=rng.choice(["", "Jane", "Jane  Q Doe", " Li "]),
+        followers=rng.randint(0, 20000),
+        is_business_account=rng.random() < 0.25,
+        is_verified=rng.random() < 0.03,
+    )
+
+
+def make_adversarial_profiles(n, seed=0):
+    rng = random.Random(seed)
+    return [make_adversarial_profile(i, rng) for i in range(n)]
+
+
+def make_fixture(accounts, n, seed=0, overlap=0.2):
+    # {account: [follower fields]} for FakeInstaloader; `overlap` of each account's followers
+    # come from a shared pool so multi-account linking is exercised too
+    rng = random.Random(seed)
+    shared = [make_profile(i, rng) for i in range(int(n * overlap))]
+    fixture, next_id = {}, len(shared)
+    for account in accounts:
+        own = [make_profile(next_id + i, rng) for i in range(n - len(shared))]
+        next_id += len(own)
+        followers = shared + own
+        rng.shuffle(followers)
+        fixture[account] = [vars(p) for p in followers]
+    return fixture
+
+
+def write_fixture(path, accounts, n, seed=0, overlap=0.2):
+    with open(path, 'w') as f:
+        json.dump(make_fixture(accounts, n, seed, overlap), f)
+    return path
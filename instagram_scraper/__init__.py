@@ -0,0 +1,33 @@
+import importlib
+
+# Public names resolve on first use, so importing the package (and `python -m instagram_scraper --help`)
+# does not pull in numpy, pandas, instaloader or tkinter
+EXPORTS = {
+    'InstagramFollowerScraper': 'scraper', 'iter_chunks': 'scraper',
+    'FakeInstaloader': 'source', 'CustomRateController': 'source',
+    'COLUMNS': 'schema', 'ACCOUNT_SEPARATOR': 'schema', 'SQLITE_COLUMN_TYPES': 'schema',
+    'ARROW_COLUMN_TYPES': 'schema', 'RAW_FIELDS': 'schema',
+    'extract_record': 'extract', 'extract_batch': 'extract', 'score_follower': 'extract',
+    'cache_entry': 'extract', 'cached_record': 'extract', 'reextract_entry': 'extract',
+    'RecordStore': 'records', 'IdIndex': 'records', 'RowLookup': 'records', 'sorted_unique': 'records',
+    'StateStore': 'state', 'CheckpointJournal': 'state',
+    'ProfileCache': 'cache', 'GzipCacheBackend': 'cache', 'SQLiteCacheBackend': 'cache', 'open_cache_backend': 'cache',
+    'StreamingAnalytics': 'analytics', 'P2Quantile': 'analytics',
+    'StageMetrics': 'metrics', 'RunProfiler': 'metrics', 'diff_profiles': 'metrics', 'timed': 'metrics',
+    'OutputSink': 'sinks', 'CSVSink': 'sinks', 'JSONLinesSink': 'sinks', 'SQLiteSink': 'sinks',
+    'ShardedSink': 'sinks', 'SINKS': 'sinks', 'open_sink': 'sinks', 'write_arrow': 'sinks', 'arrow_table': 'sinks',
+    'SnapshotStore': 'snapshots', 'diff_snapshots': 'snapshots',
+    'ScraperGUI': 'gui', 'send_completion_email': 'notification', 'run_every': 'scheduler', 'main': 'cli',
+}
+
+__all__ = list(EXPORTS)
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS))
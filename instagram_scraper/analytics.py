@@ -0,0 +1,100 @@
+import bisect
+from datetime import datetime
+
+class P2Quantile:
+    # Jain & Chlamtac's P-square estimator: five markers, constant memory
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        h, n = self.heights, self.positions
+        if len(h) < 5:
+            bisect.insort(h, x)
+            return
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(h, x) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                q = h[i] + d / (n[i + 1] - n[i - 1]) * ((n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+                                                        (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+                if not h[i - 1] < q < h[i + 1]:
+                    q = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = q
+                n[i] += d
+
+    def value(self):
+        if len(self.heights) < 5:
+            return self.heights[round(self.p * (len(self.heights) - 1))] if self.heights else None
+        return self.heights[2]
+
+class StreamingAnalytics:
+    METRICS = ('followers_count', 'value')
+
+    def __init__(self, segments=(100, 1000), quantiles=(0.5, 0.9, 0.99)):
+        self.edges = sorted(segments)
+        bounds = [f"{a}-{b}" for a, b in zip(self.edges, self.edges[1:])]
+        self.labels = [f"<{self.edges[0]}"] + bounds + [f"{self.edges[-1]}+"] if self.edges else ["all"]
+        self.quantile_levels = list(quantiles)
+        self.reset()
+
+    def reset(self):
+        self.count = self.business = self.verified = 0
+        self.sums = {m: 0 for m in self.METRICS}
+        self.segment_counts = [0] * len(self.labels)
+        self.quantiles = {m: [P2Quantile(q) for q in self.quantile_levels] for m in self.METRICS}
+
+    def add_values(self, followers_count, value, is_business, is_verified):
+        self.count += 1
+        self.business += is_business == 'True'
+        self.verified += is_verified == 'True'
+        for metric, x in zip(self.METRICS, (followers_count, value)):
+            if x != "":
+                self.sums[metric] += x
+                for estimator in self.quantiles[metric]:
+                    estimator.add(x)
+        self.segment_counts[bisect.bisect_right(self.edges, followers_count or 0)] += 1
+
+    def add(self, record):
+        self.add_values(record['followers_count'], record['value'], record['is_business'], record['is_verified'])
+
+    def add_store(self, store):
+        for start in range(0, len(store), 10000):
+            for row in store.rows(('followers_count', 'value', 'is_business', 'is_verified'), start, start + 10000):
+                self.add_values(*row)
+
+    def snapshot(self):
+        return {
+            'total': self.count,
+            'business_pct': self.business / self.count * 100 if self.count else 0.0,
+            'verified_pct': self.verified / self.count * 100 if self.count else 0.0,
+            'means': {m: self.sums[m] / self.count if self.count else 0.0 for m in self.METRICS},
+            'segments': dict(zip(self.labels, self.segment_counts)),
+            'quantiles': {m: {f"p{q * 100:g}": e.value() for q, e in zip(self.quantile_levels, self.quantiles[m])}
+                          for m in self.METRICS},
+            'timestamp': datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def describe(snapshot):
+        quantiles = "; ".join(f"{m}: " + ", ".join(f"{q}={v:.2f}" for q, v in qs.items() if v is not None)
+                              for m, qs in snapshot['quantiles'].items())
+        return (f"Analytics: Total={snapshot['total']}, Business={snapshot['business_pct']:.2f}%, "
+                f"Verified={snapshot['verified_pct']:.2f}%, Avg Followers={snapshot['means']['followers_count']:.0f}, "
+                f"Avg Value={snapshot['means']['value']:.2f}\nFollower Segments: {snapshot['segments']}\n"
+                f"Quantiles: {quantiles}")
@@ -0,0 +1,257 @@
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+class GzipCacheBackend:
+    # Each flush appends one gzip member of JSON lines [key, value, expires_at, updated_at]; gzip
+    # reads the members back as one stream. Only compact() and close() rewrite the whole file.
+    # Every entry stays in memory, so ProfileCache's max_entries does not bound this backend.
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.entries = {}
+        self.appended = False
+        if os.path.exists(cache_file):
+            self.load()
+
+    def load(self):
+        try:
+            with gzip.open(self.cache_file, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    stored = json.loads(line)
+                    if isinstance(stored, list):
+                        key, value, expires_at, updated_at = stored
+                        self.entries[key] = (value, expires_at, updated_at)
+                        continue
+                    # Caches written before flushes became appends hold a single JSON object
+                    # with no trailing newline, so they are converted before anything is appended
+                    if stored.get('__format__') == 2:
+                        self.entries.update((k, (*v, 0)) for k, v in stored['entries'].items())
+                    else:
+                        self.entries.update((k, (v, None, 0)) for k, v in stored.items())
+                    self.appended = True
+        except (OSError, EOFError, ValueError) as e:
+            # A torn last member would hide everything appended after it
+            logging.error(f"Cache load error, keeping {len(self.entries)} entries read before it: {e}")
+            self.appended = True
+        if self.appended:
+            self.write(dict(self.entries))
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+        return entry[:2] if entry else None
+
+    def iter_items(self, batch_size=1000):
+        # Walks the live dict a batch at a time rather than copying it; adding entries meanwhile
+        # raises RuntimeError, which is fine for its only caller, reextract, since it never writes
+        now = time.time()
+        entries = iter(self.entries.items())
+        while True:
+            with self.lock:
+                batch = list(islice(entries, batch_size))
+            if not batch:
+                return
+            for key, (value, expires_at, _) in batch:
+                if expires_at is None or expires_at > now:
+                    yield key, value
+
+    def put_many(self, items):
+        now = time.time()
+        with self.lock:
+            for key, value, expires_at in items:
+                self.entries[key] = (value, expires_at, now)
+        # The file is written outside self.lock, so get() never waits on a flush
+        text = "".join(json.dumps([key, value, expires_at, now]) + "\n" for key, value, expires_at in items)
+        with self.write_lock:
+            with gzip.open(self.cache_file, 'at', encoding='utf-8') as f:
+                f.write(text)
+            self.appended = True
+
+    def write(self, entries):
+        with gzip.open(self.cache_file + '.tmp', 'wt', encoding='utf-8') as f:
+            for key, entry in entries.items():
+                f.write(json.dumps([key, *entry]) + "\n")
+        os.replace(self.cache_file + '.tmp', self.cache_file)
+        self.appended = False
+
+    def compact(self, max_entries=None):
+        now = time.time()
+        with self.write_lock:
+            with self.lock:
+                before = len(self.entries)
+                self.entries = {k: v for k, v in self.entries.items() if v[1] is None or v[1] > now}
+                if max_entries is not None and len(self.entries) > max_entries:
+                    # Keep the most recently written entries, like SQLite's ORDER BY updated_at
+                    newest = sorted(self.entries.items(), key=lambda item: item[1][2])[-max_entries:]
+                    self.entries = dict(newest)
+                entries = dict(self.entries)
+            self.write(entries)
+        return before - len(entries), len(entries)
+
+    def close(self):
+        with self.write_lock:
+            if self.appended:
+                with self.lock:
+                    entries = dict(self.entries)
+                self.write(entries)
+
+class SQLiteCacheBackend:
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                              "expires_at REAL, updated_at REAL NOT NULL)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def iter_items(self, batch_size=1000):
+        last_key = ""
+        while True:
+            with self.lock:
+                rows = self.conn.execute("SELECT key, value FROM cache WHERE key > ? AND (expires_at IS NULL OR expires_at > ?) "
+                                         "ORDER BY key LIMIT ?", (last_key, time.time(), batch_size)).fetchall()
+            if not rows:
+                return
+            for key, value in rows:
+                yield key, json.loads(value)
+            last_key = rows[-1][0]
+
+    def put_many(self, items):
+        now = time.time()
+        rows = [(key, json.dumps(value), expires_at, now) for key, value, expires_at in items]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO cache (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)", rows)
+
+    def compact(self, max_entries=None):
+        with self.lock:
+            with self.conn:
+                removed = self.conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                                            (time.time(),)).rowcount
+                if max_entries is not None:
+                    removed += self.conn.execute("DELETE FROM cache WHERE key NOT IN "
+                                                 "(SELECT key FROM cache ORDER BY updated_at DESC LIMIT ?)",
+                                                 (max_entries,)).rowcount
+            self.conn.execute("VACUUM")
+            remaining = self.conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return removed, remaining
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def open_cache_backend(cache_file, backend=None):
+    backend = backend or ("sqlite" if cache_file.endswith(".db") else "gzip")
+    if backend == "sqlite":
+        return SQLiteCacheBackend(cache_file)
+    return GzipCacheBackend(cache_file)
+
+class ProfileCache:
+    # max_entries bounds the in-memory LRU; total memory is only bounded with a backend that keeps
+    # its entries on disk (SQLite), since the gzip backend holds the whole cache anyway
+    def __init__(self, backend, max_entries=100000, ttl=None, shards=16, flush_interval=30, flush_threshold=500):
+        self.backend = backend
+        self.ttl = ttl
+        self.shard_capacity = max(1, max_entries // shards)
+        self.shards = [OrderedDict() for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self.counters = [{'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0} for _ in range(shards)]
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.pending = {}
+        self.pending_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.flush_requested = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_loop, name="cache-flush", daemon=True)
+        self.flusher.start()
+
+    def shard(self, key):
+        return hash(key) % len(self.shards)
+
+    def get(self, key):
+        i = self.shard(key)
+        with self.locks[i]:
+            entries = self.shards[i]
+            entry = entries.get(key)
+            if entry is not None:
+                entries.move_to_end(key)
+        if entry is None:
+            with self.pending_lock:
+                entry = self.pending.get(key)
+        if entry is None:
+            entry = self.backend.get(key)
+            if entry is not None:
+                self.remember(i, key, entry)
+        with self.locks[i]:
+            if entry is None:
+                self.counters[i]['misses'] += 1
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                self.shards[i].pop(key, None)
+                self.counters[i]['expired'] += 1
+                self.counters[i]['misses'] += 1
+                return None
+            self.counters[i]['hits'] += 1
+            return entry[0]
+
+    def remember(self, i, key, entry):
+        with self.locks[i]:
+            entries = self.shards[i]
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self.shard_capacity:
+                entries.popitem(last=False)
+                self.counters[i]['evictions'] += 1
+
+    def put(self, key, value):
+        entry = (value, time.time() + self.ttl if self.ttl else None)
+        self.remember(self.shard(key), key, entry)
+        with self.pending_lock:
+            self.pending[key] = entry
+            if len(self.pending) >= self.flush_threshold:
+                self.flush_requested.set()
+
+    def stats(self):
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+        for i, counters in enumerate(self.counters):
+            with self.locks[i]:
+                for k in totals:
+                    totals[k] += counters[k]
+        totals['entries'] = sum(len(entries) for entries in self.shards)
+        return totals
+
+    def flush_loop(self):
+        while True:
+            self.flush_requested.wait(self.flush_interval)
+            self.flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Cache flush error: {e}")
+
+    def flush(self):
+        with self.flush_lock:
+            with self.pending_lock:
+                if not self.pending:
+                    return
+                pending = dict(self.pending)
+            self.backend.put_many([(key, value, expires_at) for key, (value, expires_at) in pending.items()])
+            with self.pending_lock:
+                for key, entry in pending.items():
+                    if self.pending.get(key) is entry:
+                        del self.pending[key]
@@ -0,0 +1,213 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from contextlib import nullcontext
+
+from .schema import COLUMNS
+
+def cache_command(argv):
+    parser = argparse.ArgumentParser(prog='instagram_scraper cache', description='Manage the profile cache')
+    parser.add_argument('action', choices=['compact'], help='compact: drop expired entries and reclaim space')
+    parser.add_argument('cache_file', help='Cache file (<user>_cache.json.gz or <user>_cache.db)')
+    parser.add_argument('--backend', choices=['gzip', 'sqlite'], help='Cache backend (inferred from the extension by default)')
+    parser.add_argument('--max-entries', type=int, help='Also keep only the most recently written N entries')
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.cache_file):
+        parser.error(f"{args.cache_file} does not exist")
+    from .cache import open_cache_backend
+    backend = open_cache_backend(args.cache_file, args.backend)
+    removed, remaining = backend.compact(args.max_entries)
+    backend.close()
+    print(f"Compacted {args.cache_file}: removed {removed} entries, {remaining} remaining")
+
+def reextract_command(argv):
+    parser = argparse.ArgumentParser(prog='instagram_scraper reextract',
+                                     description='Rebuild output from the local cache/checkpoint without network access')
+    parser.add_argument('urls', nargs='+', help='Instagram profile URLs of the original run')
+    parser.add_argument('--output', default='followers_data.csv', help='Output file')
+    parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'sqlite', 'parquet', 'feather'], default='csv', help='Output format')
+    parser.add_argument('--db-file', help='SQLite database file for sqlite format (default: the output file with a .db extension)')
+    parser.add_argument('--columns', nargs='+', help='Columns to include', choices=COLUMNS)
+    parser.add_argument('--checkpoint-mode', choices=['full', 'journal'], default='full', help='Checkpoint format of the original run')
+    parser.add_argument('--state-db', help='State database of the original run')
+    parser.add_argument('--cache-backend', choices=['gzip', 'sqlite'],
+                        help='Profile cache backend of the original run (default: sqlite, or gzip if a gzip cache exists)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Extraction processes (default: CPU count, 0 = in-process)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Records read and extracted per chunk')
+    parser.add_argument('--profile', action='store_true', help='Profile the run with cProfile and tracemalloc')
+    args = parser.parse_args(argv)
+    usernames = [url.split('/')[-1].strip('/') for url in args.urls]
+    from .scraper import InstagramFollowerScraper
+    scraper = InstagramFollowerScraper(usernames, output_file=args.output, checkpoint_mode=args.checkpoint_mode,
+                                       state_db=args.state_db, cache_backend=args.cache_backend, extract_workers=args.workers)
+    with scraper.profiling(args.profile):
+        scraper.reextract(format=args.format, columns=args.columns, db_file=args.db_file, chunk_size=args.chunk_size)
+
+def stats_command(argv):
+    parser = argparse.ArgumentParser(prog='instagram_scraper stats', description='Show live analytics of a running or finished scrape')
+    parser.add_argument('stats_file', help='Stats file written during the run (<user>_stats.json)')
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.stats_file):
+        parser.error(f"{args.stats_file} does not exist")
+    with open(args.stats_file, 'r') as f:
+        snapshot = json.load(f)
+    from .analytics import StreamingAnalytics
+    print(StreamingAnalytics.describe(snapshot))
+    print(f"This run: {snapshot.get('run', {})} (as of {snapshot['timestamp']})")
+
+def profile_command(argv):
+    parser = argparse.ArgumentParser(prog='instagram_scraper profile', description='Compare saved run profiles')
+    parser.add_argument('action', choices=['diff'], help='diff: functions whose time changed most between two runs')
+    parser.add_argument('old', help='Baseline <user>_profile.json')
+    parser.add_argument('new', help='Profile to compare against the baseline')
+    parser.add_argument('--top', type=int, default=30, help='Functions to show')
+    parser.add_argument('--key', choices=['tottime', 'cumtime', 'calls'], default='tottime', help='Measure to compare')
+    args = parser.parse_args(argv)
+    with open(args.old) as f_old, open(args.new) as f_new:
+        old, new = json.load(f_old), json.load(f_new)
+    from .metrics import diff_profiles
+    print(f"{'delta':>12} {'old':>12} {'new':>12}  function ({args.key})")
+    for delta, before, after, name in diff_profiles(old, new, args.top, args.key):
+        print(f"{delta:>+12.4f} {before:>12.4f} {after:>12.4f}  {name}")
+
+def snapshot_command(argv):
+    parser = argparse.ArgumentParser(prog='instagram_scraper snapshot', description='List or compare the run snapshots kept by --snapshot-dir')
+    parser.add_argument('action', choices=['list', 'diff'], help='list: snapshots in a directory; diff: added, removed and changed followers per account')
+    parser.add_argument('paths', nargs='+', help='Snapshot directory (diff compares its two latest snapshots), or the old and new snapshot to diff')
+    parser.add_argument('--output', help='Write every change as JSON Lines to this file')
+    args = parser.parse_args(argv)
+    from .snapshots import SnapshotStore, changed_fields, diff_snapshots, read_manifest
+    if args.action == 'list':
+        for path in SnapshotStore(args.paths[0]).snapshots():
+            manifest = read_manifest(path)
+            print(f"{path}  {manifest['created']}  rows={manifest['rows']}  "
+                  + ", ".join(f"{account}={n}" for account, n in manifest['accounts'].items()))
+        return
+    if len(args.paths) == 1:
+        snapshots = SnapshotStore(args.paths[0]).snapshots()
+        if len(snapshots) < 2:
+            parser.error(f"{args.paths[0]} has fewer than two snapshots")
+        old, new = snapshots[-2:]
+    else:
+        old, new = args.paths[:2]
+    for path in (old, new):
+        if not os.path.exists(os.path.join(path, 'manifest.json')):
+            parser.error(f"{path} is not a snapshot")
+    counts = {}
+    with open(args.output, 'w', encoding='utf-8') if args.output else nullcontext() as out:
+        for change, account, key, before, after in diff_snapshots(old, new):
+            entry = counts.setdefault(account, {'added': 0, 'removed': 0, 'changed': 0})
+            entry[change] += 1
+            if out:
+                line = {'change': change, 'account': account, 'key': key, 'username': (after or before)['username']}
+                if change == 'changed':
+                    line['fields'] = changed_fields(before, after)
+                else:
+                    line['record'] = after or before
+                out.write(json.dumps(line, ensure_ascii=False) + "\n")
+    print(f"{old} -> {new}")
+    for account, entry in sorted(counts.items()):
+        print(f"  {account}: +{entry['added']} added, -{entry['removed']} removed, ~{entry['changed']} changed")
+    if not counts:
+        print("  no changes")
+
+COMMANDS = {'cache': cache_command, 'reextract': reextract_command, 'stats': stats_command, 'profile': profile_command,
+            'snapshot': snapshot_command}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    parser = argparse.ArgumentParser(prog='instagram_scraper', description='Instagram Follower Scraper')
+    parser.add_argument('urls', nargs='*', help='Instagram profile URLs')
+    parser.add_argument('--login-user', help='Your Instagram username')
+    parser.add_argument('--login-pass', help='Your Instagram password')
+    parser.add_argument('--max', type=int, help='Max followers to scrape across all accounts')
+    parser.add_argument('--new', action='store_true', help='Start new scrape')
+    parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'sqlite', 'parquet', 'feather'], default='csv', help='Output format')
+    parser.add_argument('--db-file', help='SQLite database file for sqlite format (default: the output file with a .db extension)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Append each batch to the output file as it is scraped (csv, jsonl, sqlite); with several '
+                             'accounts and the accounts column, csv/jsonl are rewritten once at the end')
+    parser.add_argument('--flush-interval', type=float, default=5.0, help='Seconds between flushes of the streamed output')
+    parser.add_argument('--shard-rows', type=int, help='Write csv/jsonl output as rotating shards of at most N rows')
+    parser.add_argument('--shard-mb', type=float, help='Rotate csv/jsonl shards once they reach about this many compressed MB')
+    parser.add_argument('--compression', choices=['gzip', 'zstd', 'none'], default='gzip', help='Compression of output shards')
+    parser.add_argument('--checkpoint-mode', choices=['full', 'journal'], default='full',
+                        help='Checkpoint format: full rewrite or append-only journal with periodic compaction')
+    parser.add_argument('--state-db', help='Keep run state in this SQLite database instead of the JSON checkpoint')
+    parser.add_argument('--cache-size', type=int, default=100000, help='Max profiles kept in the in-memory LRU (bounds memory only with the sqlite cache backend)')
+    parser.add_argument('--cache-backend', choices=['gzip', 'sqlite'],
+                        help='Persistent profile cache backend (default: sqlite, or gzip if a gzip cache from an earlier run exists)')
+    parser.add_argument('--cache-ttl', type=float, default=30, help='Days before a cached profile expires (0 = never)')
+    parser.add_argument('--extract-workers', type=int, help='Processes for bio extraction (default: 0 = extract in the I/O threads)')
+    parser.add_argument('--chunk-size', type=int, default=8, help='Minimum profiles per task sent to each extraction process')
+    parser.add_argument('--proxies', nargs='+', help='List of proxy URLs')
+    parser.add_argument('--config', help='Path to JSON config file')
+    parser.add_argument('--min-followers', type=int, help='Minimum follower count')
+    parser.add_argument('--segments', type=int, nargs='+', default=[100, 1000], help='Follower-count bucket edges for analytics')
+    parser.add_argument('--columns', nargs='+', help='Columns to include', choices=COLUMNS)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--business-only', action='store_true', help='Scrape only business accounts')
+    group.add_argument('--non-business-only', action='store_true', help='Scrape only non-business accounts')
+    parser.add_argument('--verified-only', action='store_true', help='Scrape only verified accounts')
+    parser.add_argument('--location', help='Filter by location in bio')
+    parser.add_argument('--dry-run', action='store_true', help='Preview results without saving')
+    parser.add_argument('--schedule', type=int, help='Run every X hours')
+    parser.add_argument('--snapshot-dir', help='Keep a snapshot of every completed run here, for `snapshot diff`')
+    parser.add_argument('--profile', action='store_true', help='Profile the run with cProfile and tracemalloc')
+    parser.add_argument('--metrics-port', type=int, help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--fake-backend', metavar='FIXTURE', help='Serve followers from a JSON fixture instead of Instagram (offline runs)')
+    parser.add_argument('--fake-latency', type=float, default=0.0, help='Simulated seconds per page of 50 followers with --fake-backend')
+    parser.add_argument('--gui', action='store_true', help='Launch GUI mode')
+    args = parser.parse_args(argv)
+    
+    usernames = [url.split('/')[-1].strip('/') for url in args.urls] if args.urls else ["example"]
+    from .scraper import InstagramFollowerScraper
+    from .source import FakeInstaloader
+    scraper = InstagramFollowerScraper(usernames, max_followers=args.max, proxies=args.proxies, 
+                                       config_file=args.config, gui=args.gui, checkpoint_mode=args.checkpoint_mode,
+                                       state_db=args.state_db, cache_size=args.cache_size,
+                                       cache_backend=args.cache_backend, cache_ttl=args.cache_ttl * 86400 or None,
+                                       extract_workers=args.extract_workers, chunk_size=args.chunk_size,
+                                       output_format=args.format, output_columns=args.columns, db_file=args.db_file,
+                                       stream=args.stream, flush_interval=args.flush_interval, segments=args.segments,
+                                       snapshot_dir=args.snapshot_dir, shard_rows=args.shard_rows,
+                                       shard_bytes=int(args.shard_mb * 1e6) if args.shard_mb else None, compression=args.compression,
+                                       source=FakeInstaloader(args.fake_backend, args.fake_latency) if args.fake_backend else None)
+    
+    if args.gui:
+        return  # GUI mode runs its own loop
+    
+    if args.new and scraper.has_checkpoint():
+        scraper.clear_checkpoint()
+        logging.info("Starting fresh - deleted checkpoint")
+    scraper.start_new = args.new
+    
+    if args.login_user and args.login_pass:
+        scraper.login(args.login_user, args.login_pass)
+    
+    if args.metrics_port:
+        scraper.metrics.serve(args.metrics_port)
+    
+    if args.schedule:
+        runs = []
+
+        def job():
+            # Each later run scrapes afresh instead of resuming the finished one
+            if runs:
+                scraper.start_over()
+            runs.append(True)
+            with scraper.profiling(args.profile):
+                scraper.scrape_followers(min_followers=args.min_followers, business_only=args.business_only, 
+                                        non_business_only=args.non_business_only, verified_only=args.verified_only, 
+                                        location_filter=args.location, dry_run=args.dry_run)
+        from .scheduler import run_every
+        run_every(args.schedule, job)
+    else:
+        with scraper.profiling(args.profile):
+            scraper.scrape_followers(min_followers=args.min_followers, business_only=args.business_only, 
+                                    non_business_only=args.non_business_only, verified_only=args.verified_only, 
+                                    location_filter=args.location, dry_run=args.dry_run)
@@ -0,0 +1,179 @@
+import re
+import zlib
+from datetime import datetime
+
+from .schema import RAW_FIELDS
+
+EMAIL_VALID_RE = re.compile(r'^[\w.+-]+@[\w-]+\.[\w.-]+$')
+PHONE_VALID_RE = re.compile(r'^\+?\d{7,15}$')
+PHONE_STRIP_RE = re.compile(r'[^\d+]')
+DIGIT_RUN_RE = re.compile(r'\d\d\d')
+BIO_FIELD_PATTERNS = {
+    'email': r'[\w.+-]+@[\w-]+\.[\w.-]+',
+    'phone': r'(?:\+\d{1,3}[-\s]?)?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}',
+    'zip': r'\b\d{5}(?:-\d{4})?\b',
+    'age': r'\b(\d{1,2})\s*(?:yo|years? old)\b',
+}
+# Each field is scanned on its own, since the same digits can be both a zip and part of a phone
+# number. Cheap pre-checks ('@' present, age wording present, a run of three digits present)
+# skip the scans a record cannot match.
+EMAIL_RE = re.compile(BIO_FIELD_PATTERNS['email'])
+PHONE_RE = re.compile(BIO_FIELD_PATTERNS['phone'])
+ZIP_RE = re.compile(BIO_FIELD_PATTERNS['zip'])
+AGE_RE = re.compile(BIO_FIELD_PATTERNS['age'], re.I)
+
+def extract_record(username, biography, external_url, full_name, followers, is_business_account, is_verified, account):
+    bio_url = f"{biography} {external_url or ''}"
+    bio_end = len(biography)
+    bio_lower = biography.lower()
+    emails = EMAIL_RE.findall(bio_url)[:3] if '@' in bio_url else []
+    phones, zip_code, age = [], "", ""
+    if DIGIT_RUN_RE.search(bio_url):
+        phones = [PHONE_STRIP_RE.sub('', p) for p in PHONE_RE.findall(bio_url)[:3]]
+        zip_match = ZIP_RE.search(biography)
+        zip_code = zip_match.group() if zip_match else ""
+    if 'yo' in bio_lower or 'year' in bio_lower:
+        age_match = AGE_RE.search(biography)
+        age = age_match.group(1) if age_match else ""
+    emails += [""] * (3 - len(emails))
+    phones += [""] * (3 - len(phones))
+
+    name_parts = full_name.split()
+    fn = name_parts[0] if name_parts else ""
+    ln = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
+
+    pins = [i for i in (biography.find('📍'), biography.find('📌')) if i >= 0]
+    if pins:
+        pin = min(pins)
+        line_end = biography.find("\n", pin)
+        location = biography[pin + 1:line_end if line_end >= 0 else bio_end].strip()
+    else:
+        location = bio_url
+    parts = location.split(',') if location else []
+    ct = parts[0].strip() if parts else ""
+    st = parts[1].strip() if len(parts) > 1 else ""
+    country = parts[2].strip() if len(parts) > 2 else ""
+
+    doby = datetime.now().year - int(age) if age else ""
+    gen = "F" if "she" in bio_lower else "M" if "he" in bio_lower else ""
+
+    uid = zlib.crc32(username.encode('utf-8')) % 1000000000
+
+    return {
+        'username': username, 'account': account, 'email': emails[0], 'email.1': emails[1], 'email.2': emails[2],
+        'phone': phones[0], 'phone.1': phones[1], 'phone.2': phones[2], 'madid': "",
+        'fn': fn, 'ln': ln, 'zip': zip_code, 'ct': ct, 'st': st, 'country': country,
+        'location': location, 'is_business': str(is_business_account),
+        'is_verified': str(is_verified), 'dob': "", 'doby': doby, 'gen': gen,
+        'age': age, 'uid': uid, 'value': score_follower(followers, is_business_account), 'followers_count': followers,
+        'accounts': account
+    }
+
+def score_follower(followers, is_business_account):
+    return round(1.0 + (0.5 if is_business_account else 0) + min(followers / 10000, 1.0), 2)
+
+def cache_entry(raw, record):
+    return {'raw': dict(zip(RAW_FIELDS, raw)), 'record': record}
+
+def cached_record(entry):
+    # Entries written before raw fields were cached are the bare record
+    return entry['record'] if 'record' in entry else entry
+
+def reextract_entry(entry):
+    if 'raw' in entry:
+        return extract_record(*(entry['raw'][f] for f in RAW_FIELDS))
+    record = dict(cached_record(entry))
+    record['value'] = score_follower(record['followers_count'], record['is_business'] == 'True')
+    return record
+
+# RE2 spellings of the extraction patterns for pyarrow.compute. Python's Unicode \w, \d and \s
+# become explicit property classes, and \b becomes a consumed non-word neighbour, which is
+# harmless because zip and age only ever use their first match.
+RE2_NW = r'[^\p{L}\p{N}_]'
+RE2_S = r'[\s\p{Z}\x{1c}-\x{1f}\x{85}]'
+RE2_NS = r'[^\s\p{Z}\x{1c}-\x{1f}\x{85}]'
+RE2_EMAIL = r'[\p{L}\p{N}_.+-]+@[\p{L}\p{N}_-]+\.[\p{L}\p{N}_.-]+'
+RE2_PHONE = rf'(?:\+\p{{Nd}}{{1,3}}(?:-|{RE2_S})?)?\(?\p{{Nd}}{{3}}\)?(?:-|{RE2_S})?\p{{Nd}}{{3}}(?:-|{RE2_S})?\p{{Nd}}{{4}}'
+RE2_ZIP = rf'(?:^|{RE2_NW})(?P<zip>\p{{Nd}}{{5}}(?:-\p{{Nd}}{{4}})?)(?:$|{RE2_NW})'
+RE2_AGE = rf'(?:^|{RE2_NW})(?P<age>\p{{Nd}}{{1,2}}){RE2_S}*(?i:yo|years? old)(?:$|{RE2_NW})'
+RE2_LOCATION = r'[📍📌](?P<location>[^\n]*)'
+RE2_PLACE = r'^(?P<ct>[^,]*)(?:,(?P<st>[^,]*))?(?:,(?P<country>[^,]*))?'
+RE2_NAME = rf'(?s)^(?P<fn>{RE2_NS}*){RE2_S}*(?P<ln>.*)$'
+
+def extract_first_three(values, pattern, field):
+    import numpy as np
+    import pyarrow.compute as pc
+    found = [pc.fill_null(pc.struct_field(pc.extract_regex(values, f'(?P<m>{pattern})'), 'm'), "").to_numpy(zero_copy_only=False)]
+    found += [np.full(len(values), "", dtype=object) for _ in range(2)]
+    # Second and third matches are rare; fall back to re.findall on just those rows
+    rows = np.flatnonzero(pc.count_substring_regex(values, pattern).to_numpy() > 1)
+    finder = re.compile(BIO_FIELD_PATTERNS[field])
+    for row, text in zip(rows, values.take(rows).to_pylist()):
+        for i, match in enumerate(finder.findall(text)[1:3], 1):
+            found[i][row] = match
+    return found
+
+def extract_batch(df, columns, account=None):
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    def text(name):
+        return pa.array(df[name].fillna("").astype(str), type=pa.string())
+
+    def field(struct, name):
+        return pc.fill_null(pc.struct_field(struct, name), "").to_numpy(zero_copy_only=False)
+
+    biography = text('biography')
+    bio_url = pc.binary_join_element_wise(biography, text('external_url'), " ")
+    out = pd.DataFrame(index=df.index)
+    out['username'] = df['username']
+    out['account'] = df['account'] if 'account' in df else account
+
+    emails = extract_first_three(bio_url, RE2_EMAIL, 'email')
+    phones = extract_first_three(bio_url, RE2_PHONE, 'phone')
+    for i, suffix in enumerate(["", ".1", ".2"]):
+        out['email' + suffix] = emails[i]
+        phone = pc.replace_substring_regex(pa.array(phones[i], type=pa.string()), r'[^\p{Nd}+]', "")
+        out['phone' + suffix] = phone.to_numpy(zero_copy_only=False)
+    out['madid'] = ""
+
+    names = pc.extract_regex(pc.utf8_trim_whitespace(text('full_name')), RE2_NAME)
+    out['fn'] = field(names, 'fn')
+    out['ln'] = pc.replace_substring_regex(pc.fill_null(pc.struct_field(names, 'ln'), ""),
+                                           rf'{RE2_S}+', " ").to_numpy(zero_copy_only=False)
+    out['zip'] = field(pc.extract_regex(biography, RE2_ZIP), 'zip')
+
+    pinned = pc.struct_field(pc.extract_regex(biography, RE2_LOCATION), 'location')
+    location = pc.if_else(pc.is_null(pinned), bio_url, pc.utf8_trim_whitespace(pinned))
+    place = pc.extract_regex(location, RE2_PLACE)
+    for name in ('ct', 'st', 'country'):
+        out[name] = pc.utf8_trim_whitespace(pc.fill_null(pc.struct_field(place, name), "")).to_numpy(zero_copy_only=False)
+    out['location'] = location.to_numpy(zero_copy_only=False)
+    is_business = df['is_business_account'].astype(bool).to_numpy()
+    out['is_business'] = np.where(is_business, 'True', 'False')
+    out['is_verified'] = np.where(df['is_verified'].astype(bool).to_numpy(), 'True', 'False')
+    out['dob'] = ""
+
+    age = field(pc.extract_regex(biography, RE2_AGE), 'age')
+    has_age = age != ""
+    doby = np.full(len(df), "", dtype=object)
+    doby[has_age] = [datetime.now().year - int(a) for a in age[has_age]]
+    out['doby'] = doby
+    lower = pc.utf8_lower(biography)
+    out['gen'] = np.where(pc.match_substring(lower, "she").to_numpy(zero_copy_only=False), "F",
+                          np.where(pc.match_substring(lower, "he").to_numpy(zero_copy_only=False), "M", ""))
+    out['age'] = age
+    out['uid'] = df['username'].map(lambda u: zlib.crc32(u.encode('utf-8'))) % 1000000000
+
+    followers = df['followers'].astype('int64').to_numpy()
+    value = 1.0 + np.where(is_business, 0.5, 0.0) + np.minimum(followers / 10000, 1.0)
+    rounded = np.round(value, 2)
+    # Exact halves (followers ending in 50) can round differently from Python's round()
+    halves = (followers < 10000) & (followers % 100 == 50)
+    rounded[halves] = [round(v, 2) for v in value[halves].tolist()]
+    out['value'] = rounded
+    out['followers_count'] = followers
+    out['accounts'] = out['account']
+    return out[columns]
@@ -0,0 +1,413 @@
+import sqlite3
+import threading
+from collections import deque
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from .analytics import StreamingAnalytics
+from .preview import open_preview
+
+class UIEvents:
+    # Mailbox between the scrape thread and the Tk loop. Progress and stats only keep their latest
+    # value, so publishing costs the same however fast records arrive. Log lines are capped at what
+    # the log pane keeps anyway.
+    COALESCED = ('progress', 'maximum', 'stats', 'status')
+
+    def __init__(self, max_messages):
+        self.lock = threading.Lock()
+        self.latest = {}
+        self.max_messages = max_messages
+        self.messages = deque(maxlen=max_messages)
+
+    def publish(self, kind, value):
+        with self.lock:
+            if kind in self.COALESCED:
+                self.latest[kind] = value
+            else:
+                self.messages.append(value)
+
+    def drain(self):
+        with self.lock:
+            latest, self.latest = self.latest, {}
+            messages, self.messages = self.messages, deque(maxlen=self.max_messages)
+        return latest, messages
+
+class ScraperGUI:
+    TICK_MS = 100
+    LOG_LINES = 1000
+    PREVIEW_ROWS = 12
+    PREVIEW_REFRESH_TICKS = 10
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.events = UIEvents(self.LOG_LINES)
+        self.thread = None
+        self.preview = None
+        self.preview_offset = 0
+        self.preview_pending = False
+        self.ticks = 0
+        self.root = tk.Tk()
+        self.root.title("Instagram Follower Scraper")
+        self.root.geometry("800x900")
+
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        input_frame = ttk.LabelFrame(main_frame, text="Input Settings", padding="5")
+        input_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(input_frame, text="Instagram URLs (comma-separated):").grid(row=0, column=0, sticky="w")
+        self.urls_entry = ttk.Entry(input_frame, width=50)
+        self.urls_entry.grid(row=0, column=1, padx=5)
+        self.urls_entry.insert(0, ",".join(self.scraper.usernames))
+
+        ttk.Label(input_frame, text="Login Username:").grid(row=1, column=0, sticky="w")
+        self.login_user_entry = ttk.Entry(input_frame, width=50)
+        self.login_user_entry.grid(row=1, column=1, padx=5)
+        self.login_user_entry.insert(0, self.scraper.login_user or "")
+
+        ttk.Label(input_frame, text="Login Password:").grid(row=2, column=0, sticky="w")
+        self.login_pass_entry = ttk.Entry(input_frame, width=50, show="*")
+        self.login_pass_entry.grid(row=2, column=1, padx=5)
+        self.login_pass_entry.insert(0, self.scraper.login_pass or "")
+
+        ttk.Label(input_frame, text="Max Followers:").grid(row=3, column=0, sticky="w")
+        self.max_followers_entry = ttk.Entry(input_frame, width=10)
+        self.max_followers_entry.grid(row=3, column=1, sticky="w", padx=5)
+        self.max_followers_entry.insert(0, str(self.scraper.max_followers or ""))
+
+        ttk.Label(input_frame, text="Config File:").grid(row=4, column=0, sticky="w")
+        self.config_entry = ttk.Entry(input_frame, width=40)
+        self.config_entry.grid(row=4, column=1, sticky="w", padx=5)
+        self.config_entry.insert(0, self.scraper.config_file or "")
+        ttk.Button(input_frame, text="Browse", command=self.browse_config).grid(row=4, column=2, padx=5)
+
+        proxy_frame = ttk.LabelFrame(main_frame, text="Proxy Settings", padding="5")
+        proxy_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(proxy_frame, text="Proxies (comma-separated):").grid(row=0, column=0, sticky="w")
+        self.proxies_entry = ttk.Entry(proxy_frame, width=50)
+        self.proxies_entry.grid(row=0, column=1, padx=5)
+        self.proxies_entry.insert(0, ",".join(self.scraper.proxies))
+
+        ttk.Label(proxy_frame, text="Min Delay (s):").grid(row=1, column=0, sticky="w")
+        self.delay_min_entry = ttk.Entry(proxy_frame, width=10)
+        self.delay_min_entry.grid(row=1, column=1, sticky="w", padx=5)
+        self.delay_min_entry.insert(0, str(self.scraper.delay_min))
+
+        ttk.Label(proxy_frame, text="Max Delay (s):").grid(row=2, column=0, sticky="w")
+        self.delay_max_entry = ttk.Entry(proxy_frame, width=10)
+        self.delay_max_entry.grid(row=2, column=1, sticky="w", padx=5)
+        self.delay_max_entry.insert(0, str(self.scraper.delay_max))
+
+        filter_frame = ttk.LabelFrame(main_frame, text="Filters", padding="5")
+        filter_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(filter_frame, text="Min Followers:").grid(row=0, column=0, sticky="w")
+        self.min_followers_entry = ttk.Entry(filter_frame, width=10)
+        self.min_followers_entry.grid(row=0, column=1, sticky="w", padx=5)
+
+        self.business_only_var = tk.BooleanVar()
+        ttk.Checkbutton(filter_frame, text="Business Only", variable=self.business_only_var).grid(row=1, column=0, sticky="w")
+
+        self.non_business_only_var = tk.BooleanVar()
+        ttk.Checkbutton(filter_frame, text="Non-Business Only", variable=self.non_business_only_var).grid(row=1, column=1, sticky="w")
+
+        self.verified_only_var = tk.BooleanVar()
+        ttk.Checkbutton(filter_frame, text="Verified Only", variable=self.verified_only_var).grid(row=2, column=0, sticky="w")
+
+        ttk.Label(filter_frame, text="Location Filter:").grid(row=3, column=0, sticky="w")
+        self.location_entry = ttk.Entry(filter_frame, width=20)
+        self.location_entry.grid(row=3, column=1, sticky="w", padx=5)
+
+        output_frame = ttk.LabelFrame(main_frame, text="Output Settings", padding="5")
+        output_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(output_frame, text="Output Format:").grid(row=0, column=0, sticky="w")
+        self.format_var = tk.StringVar(value="csv")
+        ttk.OptionMenu(output_frame, self.format_var, "csv", "json", "jsonl", "sqlite", "parquet", "feather").grid(row=0, column=1, sticky="w", padx=5)
+
+        ttk.Label(output_frame, text="Output File:").grid(row=1, column=0, sticky="w")
+        self.output_file_entry = ttk.Entry(output_frame, width=40)
+        self.output_file_entry.grid(row=1, column=1, sticky="w", padx=5)
+        self.output_file_entry.insert(0, self.scraper.output_file)
+        ttk.Button(output_frame, text="Browse", command=self.browse_output_file).grid(row=1, column=2, padx=5)
+
+        self.dry_run_var = tk.BooleanVar()
+        ttk.Checkbutton(output_frame, text="Dry Run", variable=self.dry_run_var).grid(row=2, column=0, sticky="w")
+
+        ttk.Label(output_frame, text="Columns to Include:").grid(row=3, column=0, sticky="w")
+        self.columns_listbox = tk.Listbox(output_frame, selectmode="multiple", height=5)
+        for col in self.scraper.columns:
+            self.columns_listbox.insert(tk.END, col)
+        self.columns_listbox.grid(row=3, column=1, pady=5)
+        self.columns_listbox.bind("<<ListboxSelect>>", lambda e: self.preview and self.open_preview())
+
+        control_frame = ttk.Frame(main_frame)
+        control_frame.pack(pady=5)
+
+        self.start_button = ttk.Button(control_frame, text="Start", command=self.start_scrape)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+
+        self.pause_button = ttk.Button(control_frame, text="Pause", command=self.pause_scrape, state=tk.DISABLED)
+        self.pause_button.pack(side=tk.LEFT, padx=5)
+
+        self.resume_button = ttk.Button(control_frame, text="Resume", command=self.resume_scrape, state=tk.DISABLED)
+        self.resume_button.pack(side=tk.LEFT, padx=5)
+
+        self.stop_button = ttk.Button(control_frame, text="Stop", command=self.stop_scrape, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text="Reset", command=self.reset_settings).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text="Analytics", command=self.show_analytics).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text="Preview", command=self.open_preview).pack(side=tk.LEFT, padx=5)
+
+        status_frame = ttk.LabelFrame(main_frame, text="Status", padding="5")
+        status_frame.pack(fill=tk.X, pady=5)
+
+        self.stats_label = ttk.Label(status_frame, text="Processed: 0, Business: 0, Verified: 0")
+        self.stats_label.pack()
+
+        self.progress = ttk.Progressbar(status_frame, length=400, mode='determinate')
+        self.progress.pack(pady=5)
+
+        self.status_label = ttk.Label(status_frame, text="Ready")
+        self.status_label.pack()
+
+        log_frame = ttk.LabelFrame(main_frame, text="Log", padding="5")
+        log_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        self.log_text = tk.Text(log_frame, height=8, width=90)
+        self.log_text.pack(fill=tk.BOTH, expand=True)
+
+        # Only PREVIEW_ROWS rows are ever in the tree; the scrollbar and wheel move a window over
+        # the output, which is read a page at a time
+        results_frame = ttk.LabelFrame(main_frame, text="Results", padding="5")
+        results_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        self.preview_label = ttk.Label(results_frame, text="Press Preview to browse the output")
+        self.preview_label.pack(anchor="w")
+
+        self.preview_tree = ttk.Treeview(results_frame, show="headings", height=self.PREVIEW_ROWS)
+        self.preview_scroll = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.scroll_preview)
+        self.preview_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_tree.pack(fill=tk.BOTH, expand=True)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.preview_tree.bind(sequence, self.wheel_preview)
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.after(self.TICK_MS, self.drain_events)
+
+    def run(self):
+        self.root.mainloop()
+
+    def browse_config(self):
+        file = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+        if file:
+            self.config_entry.delete(0, tk.END)
+            self.config_entry.insert(0, file)
+            self.scraper.config_file = file
+            self.scraper.load_config()
+            self.update_from_config()
+
+    def browse_output_file(self):
+        file = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("SQLite", "*.db")])
+        if file:
+            self.output_file_entry.delete(0, tk.END)
+            self.output_file_entry.insert(0, file)
+
+    def update_from_config(self):
+        self.proxies_entry.delete(0, tk.END)
+        self.proxies_entry.insert(0, ",".join(self.scraper.proxies))
+        self.login_user_entry.delete(0, tk.END)
+        self.login_user_entry.insert(0, self.scraper.login_user or "")
+        self.login_pass_entry.delete(0, tk.END)
+        self.login_pass_entry.insert(0, self.scraper.login_pass or "")
+
+    def start_scrape(self):
+        try:
+            self.scraper.usernames = self.urls_entry.get().split(",")
+            self.scraper.login_user = self.login_user_entry.get()
+            self.scraper.login_pass = self.login_pass_entry.get()
+            self.scraper.max_followers = int(self.max_followers_entry.get() or 0) or None
+            self.scraper.proxies = self.proxies_entry.get().split(",")
+            self.scraper.delay_min = float(self.delay_min_entry.get() or 1.5)
+            self.scraper.delay_max = float(self.delay_max_entry.get() or 4.0)
+            self.scraper.min_followers = int(self.min_followers_entry.get() or 0) or None
+            self.scraper.business_only = self.business_only_var.get()
+            self.scraper.non_business_only = self.non_business_only_var.get()
+            self.scraper.verified_only = self.verified_only_var.get()
+            self.scraper.location_filter = self.location_entry.get() or None
+            self.scraper.output_file = self.output_file_entry.get()
+            self.scraper.output_format = self.format_var.get()
+            self.scraper.dry_run = self.dry_run_var.get()
+            self.scraper.output_columns = [self.columns_listbox.get(i) for i in self.columns_listbox.curselection()] or None
+
+            self.scraper.stopped = False
+            self.scraper.paused = False
+            self.start_button.config(state=tk.DISABLED)
+            self.pause_button.config(state=tk.NORMAL)
+            self.stop_button.config(state=tk.NORMAL)
+            self.thread = threading.Thread(target=self.scraper.scrape_followers,
+                                           args=(self.scraper.min_followers, self.scraper.business_only,
+                                                 self.scraper.non_business_only, self.scraper.verified_only,
+                                                 self.scraper.location_filter, self.scraper.dry_run))
+            self.thread.start()
+        except ValueError as e:
+            messagebox.showerror("Invalid Input", f"Error: {e}")
+
+    def pause_scrape(self):
+        self.scraper.paused = True
+        self.pause_button.config(state=tk.DISABLED)
+        self.resume_button.config(state=tk.NORMAL)
+
+    def resume_scrape(self):
+        self.scraper.paused = False
+        self.pause_button.config(state=tk.NORMAL)
+        self.resume_button.config(state=tk.DISABLED)
+
+    def stop_scrape(self):
+        self.scraper.stopped = True
+        self.scraper.paused = False
+        self.reset_buttons()
+
+    def reset_buttons(self):
+        self.start_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.DISABLED)
+        self.resume_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.DISABLED)
+
+    def reset_settings(self):
+        self.urls_entry.delete(0, tk.END)
+        self.login_user_entry.delete(0, tk.END)
+        self.login_pass_entry.delete(0, tk.END)
+        self.max_followers_entry.delete(0, tk.END)
+        self.proxies_entry.delete(0, tk.END)
+        self.delay_min_entry.delete(0, tk.END)
+        self.delay_min_entry.insert(0, "1.5")
+        self.delay_max_entry.delete(0, tk.END)
+        self.delay_max_entry.insert(0, "4.0")
+        self.min_followers_entry.delete(0, tk.END)
+        self.business_only_var.set(False)
+        self.non_business_only_var.set(False)
+        self.verified_only_var.set(False)
+        self.location_entry.delete(0, tk.END)
+        self.format_var.set("csv")
+        self.output_file_entry.delete(0, tk.END)
+        self.output_file_entry.insert(0, "followers_data.csv")
+        self.dry_run_var.set(False)
+        self.columns_listbox.selection_clear(0, tk.END)
+        self.config_entry.delete(0, tk.END)
+
+    def open_preview(self):
+        if self.preview:
+            self.preview.close()
+            self.preview = None
+        scraper = self.scraper
+        # While a run keeps its state in SQLite that is the freshest copy; otherwise read the output
+        if scraper.state:
+            path, format = scraper.state.db_file, "state"
+        else:
+            path, format = scraper.output_path(scraper.output_format, scraper.db_file), scraper.output_format
+        columns = [self.columns_listbox.get(i) for i in self.columns_listbox.curselection()] or scraper.output_columns or scraper.columns
+        try:
+            self.preview = open_preview(path, format, columns)
+            self.preview_pending = self.preview.refresh()
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.preview = None
+            self.preview_label.config(text=f"Cannot preview {path}: {e}")
+            return
+        self.preview_tree.config(columns=self.preview.columns)
+        for column in self.preview.columns:
+            self.preview_tree.heading(column, text=column)
+            self.preview_tree.column(column, width=100, stretch=True)
+        self.preview_offset = 0
+        self.render_preview()
+
+    def render_preview(self):
+        total = len(self.preview)
+        self.preview_offset = max(0, min(self.preview_offset, total - self.PREVIEW_ROWS))
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        for row in self.preview.rows(self.preview_offset, self.PREVIEW_ROWS):
+            self.preview_tree.insert("", tk.END, values=["" if v is None else v for v in row])
+        if total:
+            self.preview_scroll.set(self.preview_offset / total, min(1.0, (self.preview_offset + self.PREVIEW_ROWS) / total))
+        else:
+            self.preview_scroll.set(0.0, 1.0)
+        shown = f"{self.preview_offset + 1}-{min(total, self.preview_offset + self.PREVIEW_ROWS)}" if total else "0"
+        self.preview_label.config(text=f"Rows {shown} of {total}")
+
+    def scroll_preview(self, action, amount, unit=None):
+        if not self.preview:
+            return
+        if action == "moveto":
+            self.preview_offset = int(float(amount) * len(self.preview))
+        else:
+            self.preview_offset += int(amount) * (self.PREVIEW_ROWS if unit == "pages" else 1)
+        self.render_preview()
+
+    def wheel_preview(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_preview("scroll", -3)
+        else:
+            self.scroll_preview("scroll", 3)
+        return "break"
+
+    def show_analytics(self):
+        messagebox.showinfo("Live Analytics", StreamingAnalytics.describe(self.scraper.analytics.snapshot()))
+
+    # set_status, set_stats, set_progress and log are called from the scrape thread; they only
+    # publish, and drain_events applies them on the Tk thread
+    def set_status(self, status):
+        self.events.publish('status', status)
+        self.events.publish('log', status)
+
+    def set_stats(self, stats):
+        self.events.publish('stats', dict(stats))
+
+    def set_progress(self, value, maximum=None):
+        if maximum is not None:
+            self.events.publish('maximum', maximum)
+        self.events.publish('progress', value)
+
+    def log(self, text):
+        self.events.publish('log', text)
+
+    def drain_events(self):
+        latest, messages = self.events.drain()
+        if 'maximum' in latest:
+            self.progress['maximum'] = latest['maximum']
+        if 'progress' in latest:
+            self.progress['value'] = latest['progress']
+        if 'stats' in latest:
+            stats = latest['stats']
+            self.stats_label.config(text=f"Processed: {stats['processed']}, Business: {stats['business']}, Verified: {stats['verified']}")
+        if 'status' in latest:
+            self.status_label.config(text=latest['status'])
+        if messages:
+            self.log_text.insert(tk.END, "".join(f"{value}\n" for value in messages))
+            lines = int(self.log_text.index("end-1c").split(".")[0])
+            if lines > self.LOG_LINES:
+                self.log_text.delete("1.0", f"{lines - self.LOG_LINES}.0")
+            self.log_text.see(tk.END)
+        if self.thread and not self.thread.is_alive():
+            self.thread = None
+            self.reset_buttons()
+        self.ticks += 1
+        # Text outputs are indexed a slice per tick until caught up, then polled for appended rows
+        if self.preview and (self.preview_pending or self.ticks % self.PREVIEW_REFRESH_TICKS == 0):
+            try:
+                self.preview_pending = self.preview.refresh()
+                self.render_preview()
+            except (OSError, ValueError, sqlite3.Error) as e:
+                self.preview_label.config(text=f"Preview stopped: {e}")
+                self.preview = None
+        self.root.after(self.TICK_MS, self.drain_events)
+
+    def on_closing(self):
+        if messagebox.askokcancel("Quit", "Do you want to quit?"):
+            self.scraper.stopped = True
+            self.scraper.paused = False
+            self.root.destroy()
@@ -0,0 +1,203 @@
+import bisect
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+def timed(stage):
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.metrics.observe(stage, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+class StageMetrics:
+    BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.collectors = []
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * (len(self.BUCKETS) + 1)}
+            entry['count'] += 1
+            entry['sum'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['buckets'][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def inc(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        with self.lock:
+            self.counters[name] = value
+
+    def summary(self):
+        self.collect()
+        with self.lock:
+            stages = {name: {'count': e['count'], 'total_seconds': e['sum'], 'max_seconds': e['max'],
+                             'mean_seconds': e['sum'] / e['count'] if e['count'] else 0.0,
+                             'buckets': dict(zip([*map(str, self.BUCKETS), '+Inf'], e['buckets']))}
+                      for name, e in self.stages.items()}
+            return {'stages': stages, 'counters': dict(self.counters), 'timestamp': datetime.now().isoformat()}
+
+    def collect(self):
+        for collector in self.collectors:
+            collector()
+
+    def prometheus(self):
+        self.collect()
+        lines = ["# HELP scraper_stage_seconds Time spent in each pipeline stage",
+                 "# TYPE scraper_stage_seconds histogram"]
+        with self.lock:
+            for name, e in sorted(self.stages.items()):
+                cumulative = 0
+                for le, count in zip([*map(str, self.BUCKETS), '+Inf'], e['buckets']):
+                    cumulative += count
+                    lines.append(f'scraper_stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'scraper_stage_seconds_sum{{stage="{name}"}} {e["sum"]:.6f}')
+                lines.append(f'scraper_stage_seconds_count{{stage="{name}"}} {e["count"]}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE scraper_{name} gauge")
+                lines.append(f"scraper_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, prom_file, json_file):
+        for path, text in ((prom_file, self.prometheus()), (json_file, json.dumps(self.summary(), indent=2))):
+            with open(path + '.tmp', 'w') as f:
+                f.write(text)
+            os.replace(path + '.tmp', path)
+
+    def serve(self, port, host='127.0.0.1'):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logging.info(f"Serving metrics on http://{host}:{port}/metrics")
+        return server
+
+class RunProfiler:
+    def __init__(self, prefix, top=30, frames=10):
+        self.prefix = prefix
+        self.top = top
+        self.frames = frames
+        self.profiles = []
+        self.previous = None
+
+    def __enter__(self):
+        tracemalloc.start(self.frames)
+        open(f"{self.prefix}_alloc.txt", 'w').close()
+        self.profile_thread()
+        return self
+
+    def __exit__(self, *exc):
+        self.snapshot("end of run")
+        self.previous = None
+        tracemalloc.stop()
+        stats = None
+        for profile in self.profiles:
+            profile.disable()
+            stats = pstats.Stats(profile) if stats is None else stats.add(profile)
+        self.profiles = []
+        if stats is None:
+            return False
+        stats.dump_stats(f"{self.prefix}.prof")
+        with open(f"{self.prefix}_profile.txt", 'w') as f:
+            for order in ('cumulative', 'tottime'):
+                f.write(f"=== top {self.top} by {order} ===\n")
+                pstats.Stats(f"{self.prefix}.prof", stream=f).sort_stats(order).print_stats(self.top)
+        with open(f"{self.prefix}_profile.json", 'w') as f:
+            json.dump(self.function_totals(stats), f, indent=1, sort_keys=True)
+        logging.info(f"Profile written to {self.prefix}.prof, {self.prefix}_profile.txt and {self.prefix}_profile.json")
+        return False
+
+    def profile_thread(self):
+        # cProfile only sees the thread that enabled it, so each pool thread gets its own profiler
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            logging.warning("Another profiler is active in this thread; it will not be profiled")
+            return
+        self.profiles.append(profile)
+
+    @staticmethod
+    def function_key(filename, name):
+        # Drop install prefixes and line numbers so saved profiles diff cleanly across machines and versions
+        filename = re.sub(r'^.*[/\\](?:site-packages|lib[/\\]python[\d.]+)[/\\]', '', filename)
+        return f"{os.path.basename(filename) if os.path.isabs(filename) else filename}:{name}"
+
+    def function_totals(self, stats):
+        totals = {}
+        for (filename, _, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            entry = totals.setdefault(self.function_key(filename, name), {'calls': 0, 'tottime': 0.0, 'cumtime': 0.0})
+            entry['calls'] += calls
+            entry['tottime'] = round(entry['tottime'] + tottime, 6)
+            entry['cumtime'] = round(entry['cumtime'] + cumtime, 6)
+        return totals
+
+    def snapshot(self, label):
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        with open(f"{self.prefix}_alloc.txt", 'a') as f:
+            f.write(f"=== {label} at {datetime.now().isoformat()}: current={current / 1e6:.1f}MB peak={peak / 1e6:.1f}MB ===\n")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                f.write(f"{stat}\n")
+            if self.previous is not None:
+                f.write("--- growth since previous snapshot ---\n")
+                for stat in snapshot.compare_to(self.previous, 'lineno')[:self.top // 3]:
+                    f.write(f"{stat}\n")
+        self.previous = snapshot
+
+def diff_profiles(old, new, top=30, key='tottime'):
+    rows = []
+    for name in set(old) | set(new):
+        before, after = old.get(name, {}).get(key, 0.0), new.get(name, {}).get(key, 0.0)
+        rows.append((after - before, before, after, name))
+    rows.sort(key=lambda row: abs(row[0]), reverse=True)
+    return rows[:top]
@@ -0,0 +1,14 @@
+import logging
+import smtplib
+from email.mime.text import MIMEText
+
+def send_completion_email(email_config, usernames, processed):
+    msg = MIMEText(f"Scraping complete for {usernames}. Processed: {processed} followers.")
+    msg['Subject'] = 'Instagram Scraper Completed'
+    msg['From'] = email_config['sender']
+    msg['To'] = email_config['receiver']
+    with smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port']) as server:
+        server.starttls()
+        server.login(email_config['sender'], email_config['smtp_password'])
+        server.send_message(msg)
+    logging.info("Sent completion email")
@@ -0,0 +1,232 @@
+import bisect
+import csv
+import io
+import json
+import os
+import sqlite3
+import time
+from array import array
+
+from .state import StateStore
+
+class SQLitePreview:
+    # Key (rowid or seq) of every STRIDE-th row, so a page is a keyset seek plus an OFFSET below
+    # STRIDE rather than an OFFSET over every row before it. Like TextPreview, the index is built
+    # incrementally, within a time budget per refresh.
+    STRIDE = 256
+
+    def __init__(self, path, columns, order='rowid'):
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError(f"no database at {path}")
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(followers)")}
+        self.columns = [c for c in columns if c in existing]
+        self.order = order
+        self.select = (f"SELECT {StateStore.quoted(self.columns)} FROM followers WHERE {order} >= ? "
+                       f"ORDER BY {order} LIMIT ? OFFSET ?")
+        self.next_key = f"SELECT {order} FROM followers WHERE {order} > ? ORDER BY {order} LIMIT 1 OFFSET ?"
+        self.keys = array('q')
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def refresh(self, budget=0.05):
+        # Returns True while part of the table is still unindexed
+        count = self.conn.execute("SELECT COUNT(*) FROM followers").fetchone()[0]
+        first = self.conn.execute(f"SELECT MIN({self.order}) FROM followers").fetchone()[0]
+        if count < self.count or (self.keys and self.keys[0] != first):
+            # The table was cleared for a new run
+            self.keys = array('q')
+        self.count = count
+        deadline = time.perf_counter() + budget
+        while len(self.keys) * self.STRIDE < count:
+            if self.keys:
+                row = self.conn.execute(self.next_key, (self.keys[-1], self.STRIDE - 1)).fetchone()
+            else:
+                row = (first,)
+            if row is None:
+                break
+            self.keys.append(row[0])
+            if time.perf_counter() > deadline:
+                return len(self.keys) * self.STRIDE < count
+        return False
+
+    def rows(self, start, count):
+        start = max(0, min(start, self.count))
+        if not self.keys:
+            return []
+        # Rows past the indexed part are still reachable from the last key while the index catches up
+        i = min(start // self.STRIDE, len(self.keys) - 1)
+        return self.conn.execute(self.select, (self.keys[i], count, start - i * self.STRIDE)).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+class TextPreview:
+    # Byte offset of every STRIDE-th record, so any page is one seek plus parsing at most STRIDE
+    # records. The index is built incrementally, CHUNK bytes per refresh, and follows a file that
+    # is still being appended to.
+    STRIDE = 256
+    CHUNK = 1 << 20
+
+    def __init__(self, path, format, columns):
+        self.path = path
+        self.format = format
+        self.requested = columns
+        if format == "csv":
+            # The csv module rejects fields over 128 KiB, but a record may be longer than CHUNK
+            csv.field_size_limit(2 ** 31 - 1)
+        self.file = open(path, 'rb')
+        self.reset()
+
+    def reset(self):
+        self.offsets = array('q')
+        self.count = 0
+        self.end = 0
+        self.tail = b""
+        self.columns = list(self.requested) if self.format == "jsonl" else None
+        self.indices = None
+
+    def __len__(self):
+        return self.count
+
+    def rewritten(self):
+        # save_results and stale streamed files are rewritten in place rather than appended to
+        if os.path.getsize(self.path) < self.end:
+            return True
+        self.file.seek(self.end - len(self.tail))
+        return self.file.read(len(self.tail)) != self.tail
+
+    def refresh(self, budget=0.05):
+        # Returns True while part of the file is still unindexed
+        if self.end and self.rewritten():
+            self.reset()
+        deadline = time.perf_counter() + budget
+        while self.index_chunk():
+            if time.perf_counter() > deadline:
+                return True
+        return False
+
+    def index_chunk(self):
+        self.file.seek(self.end)
+        chunk = bytearray(self.file.read(self.CHUNK))
+        full = len(chunk) == self.CHUNK
+        start = begin = scanned = 0
+        odd = False
+        while True:
+            newline = chunk.find(b'\n', max(start, scanned))
+            if newline < 0:
+                if begin or not full:
+                    break
+                # No record ends in this chunk, so read on until one does instead of rescanning
+                # the same bytes on every refresh
+                scanned = len(chunk)
+                chunk += self.file.read(self.CHUNK)
+                full = len(chunk) - scanned == self.CHUNK
+                continue
+            if self.format == "csv":
+                # A newline inside a quoted field leaves an odd number of quotes open
+                odd ^= chunk.count(b'"', start, newline) & 1
+            start = newline + 1
+            if odd:
+                continue
+            if self.columns is None:
+                header = next(csv.reader(io.StringIO(chunk[begin:start].decode('utf-8'))))
+                self.columns = [c for c in self.requested if c in header]
+                self.indices = [header.index(c) for c in self.columns]
+            else:
+                if self.count % self.STRIDE == 0:
+                    self.offsets.append(self.end + begin)
+                self.count += 1
+            begin = start
+        if begin:
+            self.tail = bytes(chunk[max(0, begin - 64):begin])
+            self.end += begin
+        return full
+
+    def rows(self, start, count):
+        start = max(0, min(start, self.count))
+        stop = min(start + count, self.count)
+        if start >= stop:
+            return []
+        first, last = start // self.STRIDE, (stop - 1) // self.STRIDE + 1
+        offset = self.offsets[first]
+        end = self.offsets[last] if last < len(self.offsets) else self.end
+        self.file.seek(offset)
+        text = self.file.read(end - offset).decode('utf-8')
+        skip = start - first * self.STRIDE
+        if self.format == "csv":
+            records = list(csv.reader(io.StringIO(text)))[skip:skip + stop - start]
+            return [[record[i] if i < len(record) else "" for i in self.indices] for record in records]
+        lines = text.split('\n')[skip:skip + stop - start]
+        return [[record.get(c, "") for c in self.columns] for record in map(json.loads, lines)]
+
+    def close(self):
+        self.file.close()
+
+class ArrowPreview:
+    # Parquet reads only the row group holding the requested rows. Feather batches would each have
+    # to be decompressed just to learn their length, so the selected columns are read once instead;
+    # neither is memory-mapped, since save_results rewrites the file in place.
+    def __init__(self, path, format, columns):
+        self.path = path
+        self.format = format
+        self.requested = columns
+        self.load()
+
+    def load(self):
+        self.mtime = os.stat(self.path).st_mtime_ns
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+            self.file = pq.ParquetFile(self.path)
+            names = self.file.schema_arrow.names
+            sizes = [self.file.metadata.row_group(i).num_rows for i in range(self.file.num_row_groups)]
+            self.read_part = lambda i: self.file.read_row_group(i, columns=self.columns)
+        else:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+            names = pa.ipc.open_file(self.path).schema.names
+            table = feather.read_table(self.path, columns=[c for c in self.requested if c in names], memory_map=False)
+            sizes = [table.num_rows]
+            self.read_part = lambda i: table
+        self.columns = [c for c in self.requested if c in names]
+        self.starts = [0]
+        for size in sizes:
+            self.starts.append(self.starts[-1] + size)
+        self.cached = (None, None)
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def refresh(self):
+        if os.stat(self.path).st_mtime_ns != self.mtime:
+            self.load()
+        return False
+
+    def part(self, i):
+        if self.cached[0] != i:
+            self.cached = (i, self.read_part(i))
+        return self.cached[1]
+
+    def rows(self, start, count):
+        rows = []
+        stop = min(start + count, len(self))
+        while start < stop:
+            i = bisect.bisect_right(self.starts, start) - 1
+            part = self.part(i).slice(start - self.starts[i], stop - start)
+            rows.extend(zip(*(part.column(c).to_pylist() for c in self.columns)))
+            start += part.num_rows
+        return rows
+
+    def close(self):
+        self.cached = (None, None)
+
+def open_preview(path, format, columns):
+    if format in ("sqlite", "state"):
+        return SQLitePreview(path, columns, order='seq' if format == "state" else 'rowid')
+    if format in ("csv", "jsonl"):
+        return TextPreview(path, format, columns)
+    if format in ("parquet", "feather"):
+        return ArrowPreview(path, format, columns)
+    raise ValueError(f"{format} output cannot be previewed; use csv, jsonl, sqlite, parquet or feather")
@@ -0,0 +1,306 @@
+import os
+from array import array
+
+# numpy is imported inside the functions that use it, which keeps it out of the pipeline's import time
+
+class RecordStore:
+    # Mostly-unique text stays as plain str lists; repetitive text is dictionary-coded
+    TEXT = ('username', 'email', 'phone', 'ln', 'location')
+    INT_TYPES = {'uid': 'i', 'doby': 'i', 'followers_count': 'q'}
+    FLOATS = ('value',)
+    FLAGS = ('is_business', 'is_verified')
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.size = 0
+        self.data, self.pools, self.codes, self.missing = {}, {}, {}, {}
+        for c in self.columns:
+            if c in self.FLAGS:
+                self.data[c] = bytearray()
+            elif c in self.INT_TYPES:
+                self.data[c] = array(self.INT_TYPES[c])
+                self.missing[c] = -(1 << (8 * self.data[c].itemsize - 1))
+            elif c in self.FLOATS:
+                self.data[c] = array('d')
+            elif c in self.TEXT:
+                self.data[c] = []
+            else:
+                self.data[c] = array('I')
+                self.pools[c], self.codes[c] = [], {}
+        self.writers = [self.writer(c) for c in self.columns]
+        self.follower_ids = array('Q')
+        self.lookup = RowLookup()
+        # Rows whose follower id is not known yet (id 0), by username
+        self.unlinked = {}
+
+    def writer(self, column):
+        data = self.data[column]
+        if column in self.FLAGS:
+            def write(value):
+                if self.size % 8 == 0:
+                    data.append(0)
+                if value is True or value == 'True':
+                    data[self.size >> 3] |= 1 << (self.size & 7)
+            return write
+        if column in self.INT_TYPES:
+            missing = self.missing[column]
+            return lambda value: data.append(missing if value in ("", None) else int(value))
+        if column in self.FLOATS:
+            return lambda value: data.append(float('nan') if value in ("", None) else value)
+        if column in self.TEXT:
+            return data.append
+        pool, codes = self.pools[column], self.codes[column]
+
+        def write(value):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(pool)
+                pool.append(value)
+            data.append(code)
+        return write
+
+    def __len__(self):
+        return self.size
+
+    def append_row(self, row, follower_id=None):
+        for write, value in zip(self.writers, row):
+            write(value)
+        if follower_id is not None:
+            self.follower_ids.append(follower_id)
+            if follower_id:
+                self.lookup.add(follower_id, self.size)
+            else:
+                self.unlinked[row[self.columns.index('username')]] = self.size
+        self.size += 1
+
+    def append(self, record, follower_id=None):
+        self.append_row([record.get(c, "") for c in self.columns], follower_id)
+
+    def find(self, follower_id):
+        return self.lookup.find(follower_id)
+
+    def link_id(self, username, follower_id):
+        row = self.unlinked.pop(username, None)
+        if row is not None:
+            self.follower_ids[row] = follower_id
+            self.lookup.add(follower_id, row)
+        return row
+
+    def get(self, row, name):
+        return self.column(name, row, row + 1)[0]
+
+    def set_label(self, row, name, value):
+        # Only dictionary-coded columns can be rewritten in place
+        code = self.codes[name].get(value)
+        if code is None:
+            code = self.codes[name][value] = len(self.pools[name])
+            self.pools[name].append(value)
+        self.data[name][row] = code
+
+    def label_counts(self, name):
+        import numpy as np
+        counts = np.bincount(np.frombuffer(self.data[name], dtype=np.uint32), minlength=len(self.pools[name])) if self.size else []
+        return {label: int(n) for label, n in zip(self.pools[name], counts) if n}
+
+    def record(self, row):
+        return dict(zip(self.columns, next(self.rows(start=row, stop=row + 1))))
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def column(self, name, start=0, stop=None):
+        stop = self.size if stop is None else min(stop, self.size)
+        data = self.data[name]
+        if name in self.FLAGS:
+            return ['True' if data[i >> 3] >> (i & 7) & 1 else 'False' for i in range(start, stop)]
+        if name in self.INT_TYPES:
+            missing = self.missing[name]
+            return ["" if v == missing else v for v in data[start:stop]]
+        if name in self.FLOATS:
+            return ["" if v != v else v for v in data[start:stop]]
+        if name in self.TEXT:
+            return data[start:stop]
+        pool = self.pools[name]
+        return [pool[code] for code in data[start:stop]]
+
+    def rows(self, columns=None, start=0, stop=None):
+        return zip(*(self.column(c, start, stop) for c in columns or self.columns))
+
+    def records(self):
+        for row in self.rows():
+            yield dict(zip(self.columns, row))
+
+    def to_frame(self, columns=None):
+        import pandas as pd
+        columns = columns or self.columns
+        return pd.DataFrame({c: self.column(c) for c in columns}, columns=columns)
+
+    def to_columns(self):
+        columns = {c: self.column(c) for c in self.columns}
+        if len(self.follower_ids) == self.size:
+            columns['__follower_id__'] = self.follower_ids.tolist()
+        return columns
+
+    @classmethod
+    def from_checkpoint(cls, columns, checkpoint):
+        store = cls(columns)
+        if 'followers_columns' in checkpoint:
+            data = checkpoint['followers_columns']
+            size = len(next(iter(data.values()), []))
+            ids = data.get('__follower_id__') or [0] * size
+            # Columns added since the checkpoint was written come back empty
+            for follower_id, *row in zip(ids, *(data.get(c, [""] * size) for c in store.columns)):
+                store.append_row(row, follower_id)
+        else:
+            # Checkpoints from before the columnar store hold bare records with no follower ids or
+            # accounts; the ids are filled in as the resumed run meets those followers again
+            for record in checkpoint.get('followers_data', []):
+                store.append(dict(record, accounts=record.get('accounts') or record.get('account', "")), 0)
+        return store
+
+ID_DTYPE = '<u8'
+ID_SIZE = 8
+
+def sorted_unique(ids):
+    import numpy as np
+    # Plain sort + neighbour compare; np.unique is several times slower on large id arrays
+    ids = np.sort(ids)
+    return ids[np.concatenate(([True], ids[1:] != ids[:-1]))] if len(ids) else ids
+
+class IdIndex:
+    def __init__(self, path=None, merge_ratio=0.25, min_merge=100000):
+        import numpy as np
+        self.path = path
+        self.log_file = f"{path}.log" if path else None
+        self.merge_ratio = merge_ratio
+        self.min_merge = min_merge
+        self.base = np.empty(0, dtype=ID_DTYPE)
+        self.pending = set()
+        self.unsaved = []
+        self.rewrite = False
+
+    @classmethod
+    def from_ids(cls, ids, path=None):
+        import numpy as np
+        index = cls(path)
+        index.base = sorted_unique(np.fromiter(ids, dtype=ID_DTYPE))
+        index.rewrite = path is not None
+        return index
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+        index = cls(path)
+        if os.path.exists(path) and os.path.getsize(path):
+            index.base = np.memmap(path, dtype=ID_DTYPE, mode='r')
+        if os.path.exists(index.log_file):
+            with open(index.log_file, 'rb') as f:
+                data = f.read()
+            # Drop a torn trailing id left by a crash mid-append
+            logged = np.frombuffer(data[:len(data) - len(data) % ID_SIZE], dtype=ID_DTYPE)
+            index.pending.update(logged[~index.contains_many(logged)].tolist())
+        return index
+
+    def __len__(self):
+        return len(self.base) + len(self.pending)
+
+    def __contains__(self, uid):
+        if uid in self.pending:
+            return True
+        i = self.base.searchsorted(uid)
+        return i < len(self.base) and self.base[i] == uid
+
+    def contains_many(self, ids):
+        import numpy as np
+        ids = np.asarray(ids, dtype=ID_DTYPE)
+        found = np.zeros(len(ids), dtype=bool)
+        if len(self.base):
+            found = self.base[np.minimum(np.searchsorted(self.base, ids), len(self.base) - 1)] == ids
+        if self.pending:
+            found |= np.fromiter((uid in self.pending for uid in ids.tolist()), dtype=bool, count=len(ids))
+        return found
+
+    def add(self, uid):
+        if uid not in self:
+            self.pending.add(uid)
+            self.unsaved.append(uid)
+
+    def add_many(self, ids):
+        import numpy as np
+        ids = np.asarray(ids, dtype=ID_DTYPE)
+        # 0 stands for a checkpointed row whose id is not known yet
+        ids = ids[ids != 0]
+        missing = ids[~self.contains_many(ids)].tolist()
+        self.pending.update(missing)
+        self.unsaved.extend(missing)
+        return len(missing)
+
+    def clear(self):
+        import numpy as np
+        for path in (self.path, self.log_file):
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.base = np.empty(0, dtype=ID_DTYPE)
+        self.pending = set()
+        self.unsaved = []
+        self.rewrite = True
+
+    def save(self):
+        import numpy as np
+        if not self.path:
+            return
+        if self.rewrite or len(self.pending) >= max(self.min_merge, self.merge_ratio * len(self.base)):
+            self.merge()
+        elif self.unsaved:
+            with open(self.log_file, 'ab') as f:
+                f.write(np.array(self.unsaved, dtype=ID_DTYPE).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.unsaved = []
+
+    def merge(self):
+        import numpy as np
+        # Swapping in the merged array first releases the memmap before the file is replaced
+        self.base = sorted_unique(np.concatenate((self.base, np.fromiter(self.pending, dtype=ID_DTYPE, count=len(self.pending)))))
+        with open(self.path + '.tmp', 'wb') as f:
+            f.write(self.base.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.path + '.tmp', self.path)
+        # A crash before the truncate is harmless: load skips logged ids already in the base
+        open(self.log_file, 'wb').close()
+        self.pending = set()
+        self.unsaved = []
+        self.rewrite = False
+
+class RowLookup:
+    # Sorted (id, row) arrays plus a dict of recent rows, merged the same way as IdIndex
+    def __init__(self, merge_ratio=0.25, min_merge=100000):
+        import numpy as np
+        self.merge_ratio = merge_ratio
+        self.min_merge = min_merge
+        self.ids = np.empty(0, dtype=ID_DTYPE)
+        self.rows = np.empty(0, dtype=np.int64)
+        self.recent = {}
+
+    def add(self, uid, row):
+        self.recent[uid] = row
+        if len(self.recent) >= max(self.min_merge, self.merge_ratio * len(self.ids)):
+            self.merge()
+
+    def merge(self):
+        import numpy as np
+        ids = np.concatenate((self.ids, np.fromiter(self.recent.keys(), dtype=ID_DTYPE, count=len(self.recent))))
+        rows = np.concatenate((self.rows, np.fromiter(self.recent.values(), dtype=np.int64, count=len(self.recent))))
+        order = np.argsort(ids, kind='stable')
+        self.ids, self.rows = ids[order], rows[order]
+        self.recent = {}
+
+    def find(self, uid):
+        row = self.recent.get(uid)
+        if row is None and len(self.ids):
+            i = self.ids.searchsorted(uid)
+            if i < len(self.ids) and self.ids[i] == uid:
+                row = int(self.rows[i])
+        return row
@@ -0,0 +1,11 @@
+import logging
+import time
+
+import schedule
+
+def run_every(hours, job):
+    schedule.every(hours).hours.do(job)
+    logging.info(f"Scheduled to run every {hours} hours")
+    while True:
+        schedule.run_pending()
+        time.sleep(60)
@@ -0,0 +1,10 @@
+COLUMNS = [
+    'username', 'account', 'email', 'email.1', 'email.2', 'phone', 'phone.1', 'phone.2',
+    'madid', 'fn', 'ln', 'zip', 'ct', 'st', 'country', 'location', 'is_business',
+    'is_verified', 'dob', 'doby', 'gen', 'age', 'uid', 'value', 'followers_count', 'accounts'
+]
+ACCOUNT_SEPARATOR = "|"
+SQLITE_COLUMN_TYPES = {'uid': 'INTEGER', 'value': 'REAL', 'followers_count': 'INTEGER'}
+ARROW_COLUMN_TYPES = {'account': 'category', 'accounts': 'category', 'is_business': 'bool', 'is_verified': 'bool', 'doby': 'int16',
+                      'uid': 'int32', 'value': 'float32', 'followers_count': 'int64'}
+RAW_FIELDS = ['username', 'biography', 'external_url', 'full_name', 'followers', 'is_business_account', 'is_verified', 'account']
@@ -0,0 +1,775 @@
+import json
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import sys
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+
+from .analytics import StreamingAnalytics
+from .cache import ProfileCache, open_cache_backend
+from .extract import EMAIL_VALID_RE, PHONE_VALID_RE, cache_entry, cached_record, extract_batch, extract_record, reextract_entry
+from .metrics import RunProfiler, StageMetrics, timed
+from .records import IdIndex, RecordStore
+from .schema import ACCOUNT_SEPARATOR, COLUMNS
+from .sinks import SINKS, ShardedSink, SQLiteSink, open_sink, write_arrow
+from .snapshots import SnapshotStore
+from .source import CustomRateController
+from .state import CheckpointJournal, StateStore
+
+def iter_chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class InstagramFollowerScraper:
+    def __init__(self, usernames, output_file="followers_data.csv", checkpoint_file=None, 
+                 max_followers=None, delay_min=1.5, delay_max=4.0, max_retries=3, proxies=None, 
+                 config_file=None, gui=False, checkpoint_mode="full", state_db=None,
+                 cache_size=100000, cache_backend=None, cache_ttl=30 * 86400, extract_workers=None, chunk_size=8,
+                 output_format="csv", output_columns=None, db_file=None, stream=False, flush_interval=5.0,
+                 segments=(100, 1000), source=None, snapshot_dir=None, shard_rows=None, shard_bytes=None,
+                 compression="gzip"):
+        self.usernames = usernames if isinstance(usernames, list) else [usernames]
+        self.output_file = output_file
+        self.output_format = output_format
+        self.output_columns = output_columns
+        self.db_file = db_file
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.shard_rows = shard_rows
+        self.shard_bytes = shard_bytes
+        self.compression = compression
+        self.sink = None
+        self.streamed = None
+        self.checkpoint_file = checkpoint_file or f"{self.usernames[0]}_checkpoint.json"
+        self.checkpoint_mode = checkpoint_mode
+        self.journal = CheckpointJournal(self.checkpoint_file) if checkpoint_mode == "journal" else None
+        self.max_followers = max_followers
+        self.delay_min = delay_min
+        self.delay_max = delay_max
+        self.max_retries = max_retries
+        self.proxies = proxies or []
+        self.config_file = config_file
+        self.encryption_key = os.getenv('SCRAPER_KEY')
+        # Initialize login_user, login_pass, and email_config with defaults
+        self.login_user = None
+        self.login_pass = None
+        self.email_config = {}
+        self.load_config()  # May override the above if config file exists
+        import instaloader
+        self.L = instaloader.Instaloader(
+            download_pictures=False, download_videos=False, download_video_thumbnails=False,
+            download_geotags=False, download_comments=False, save_metadata=False, compress_json=False,
+            rate_controller=lambda ctx: CustomRateController(ctx)
+        )
+        # Anything exposing instaloader's Profile.from_username; FakeInstaloader runs offline
+        self.source = source or instaloader
+        self.proxy_stats = {p: {'latency': float('inf'), 'uses': 0} for p in self.proxies}
+        self.valid_proxies = self.test_proxies()
+        self.set_proxy()
+        self.followers_data = RecordStore(COLUMNS)
+        self.id_index_file = f"{self.checkpoint_file}.ids"
+        self.processed_ids = IdIndex(None if state_db else self.id_index_file)
+        self.unsaved_records = []
+        self.unsaved_accounts = {}
+        self.resume_id = None
+        self.paused = False
+        self.stopped = False
+        # SQLite by default; a gzip cache left by an earlier run keeps being used unless a backend is chosen
+        gzip_cache = f"{self.usernames[0]}_cache.json.gz"
+        cache_backend = cache_backend or ("gzip" if os.path.exists(gzip_cache) else "sqlite")
+        self.cache_file = f"{self.usernames[0]}_cache.db" if cache_backend == "sqlite" else gzip_cache
+        self.cache = ProfileCache(open_cache_backend(self.cache_file, cache_backend), max_entries=cache_size, ttl=cache_ttl)
+        self.extract_workers = extract_workers or 0
+        self.chunk_size = chunk_size
+        self.stats = {'processed': 0, 'business': 0, 'verified': 0}
+        self.analytics = StreamingAnalytics(segments)
+        self.stats_file = f"{self.usernames[0]}_stats.json"
+        self.last_stats_write = 0
+        self.metrics = StageMetrics()
+        self.metrics.collectors.append(self.collect_metrics)
+        self.metrics_file = f"{self.usernames[0]}_metrics"
+        self.profiler = None
+        self.columns = list(COLUMNS)
+        self.state = StateStore(state_db, self.columns) if state_db else None
+        self.snapshots = SnapshotStore(snapshot_dir) if snapshot_dir else None
+        logging.basicConfig(filename=f'{self.usernames[0]}_scraper.log', level=logging.INFO,
+                           format='%(asctime)s - %(levelname)s - %(message)s')
+        signal.signal(signal.SIGINT, self.pause_handler)
+        self.gui = None
+        if gui:
+            from .gui import ScraperGUI
+            self.gui = ScraperGUI(self)
+            self.gui.run()
+
+    def pause_handler(self, signum, frame):
+        # The handler runs on the main thread, which may be inside the cache, state or sink locks,
+        # so it only sets flags; the scrape loop pauses at its next batch boundary
+        if self.paused:
+            self.stopped = True
+        self.paused = True
+
+    def pause(self):
+        logging.info("Pausing scrape... Saving checkpoint")
+        self.save_checkpoint(force=True)
+        self.cache.flush()
+        if self.sink:
+            self.sink.flush()
+        if self.gui:
+            self.gui.set_status("Paused")
+        else:
+            print("Paused. Resume with the same command or Ctrl+C again to exit.")
+        while self.paused and not self.stopped:
+            time.sleep(1)
+        if self.gui and not self.stopped:
+            self.gui.set_status("Scraping")
+
+    def load_config(self):
+        if self.config_file and os.path.exists(self.config_file):
+            with open(self.config_file, 'r') as f:
+                config = json.load(f)
+            self.proxies = config.get('proxies', self.proxies)
+            self.login_user = config.get('login_user')
+            self.login_pass = self.decrypt(config['login_pass']) if config.get('login_pass') else None
+            self.email_config = config.get('email_config', {})
+            logging.info(f"Loaded config from {self.config_file}")
+
+    def decrypt(self, token):
+        from cryptography.fernet import Fernet
+        cipher = Fernet(self.encryption_key or Fernet.generate_key())
+        return cipher.decrypt(token.encode()).decode()
+
+    def test_proxies(self):
+        if not self.proxies:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(self.proxies), 4)) as executor:
+            results = list(executor.map(self.test_proxy, self.proxies))
+        valid = [p for p, v in zip(self.proxies, results) if v]
+        logging.info(f"Valid proxies: {len(valid)}/{len(self.proxies)}")
+        return valid
+
+    def test_proxy(self, proxy):
+        import requests
+        start = time.time()
+        try:
+            requests.get("https://www.instagram.com", proxies={"http": proxy, "https": proxy}, timeout=5)
+            latency = time.time() - start
+            self.proxy_stats[proxy]['latency'] = latency
+            self.proxy_stats[proxy]['uses'] = 1
+            return True
+        except Exception:
+            return False
+
+    def set_proxy(self):
+        if self.valid_proxies:
+            proxy = min(self.valid_proxies, key=lambda p: self.proxy_stats[p]['latency'] / max(self.proxy_stats[p]['uses'], 1))
+            self.proxy_stats[proxy]['uses'] += 1
+            self.L.context._session.proxies = {"http": proxy, "https": proxy}
+            self.L.context._session.timeout = 10
+            logging.info(f"Using proxy: {proxy} (latency: {self.proxy_stats[proxy]['latency']:.2f}s)")
+
+    def login(self, username=None, password=None, session_file=None):
+        username = username or getattr(self, 'login_user', None)
+        password = password or getattr(self, 'login_pass', None)
+        for attempt in range(self.max_retries):
+            try:
+                if session_file and os.path.exists(session_file):
+                    self.L.load_session_from_file(username, session_file)
+                elif username and password:
+                    self.L.login(username, password)
+                    if session_file:
+                        self.L.save_session_to_file(session_file)
+                logging.info(f"Logged in as {username}")
+                return True
+            except Exception as e:
+                logging.error(f"Login attempt {attempt + 1} failed: {e}")
+                time.sleep(random.uniform(5, 10))
+        logging.error("Max login retries reached")
+        return False
+
+    def has_checkpoint(self):
+        if self.state:
+            return self.state.exists()
+        return os.path.exists(self.checkpoint_file) or bool(self.journal and self.journal.exists())
+
+    def clear_checkpoint(self):
+        if os.path.exists(self.checkpoint_file):
+            os.remove(self.checkpoint_file)
+        if self.journal:
+            self.journal.clear()
+        if self.state:
+            self.state.clear()
+        self.processed_ids.clear()
+        self.unsaved_records = []
+        self.unsaved_accounts = {}
+
+    def start_over(self):
+        # Forget the previous run entirely, as each --schedule run scrapes the accounts afresh
+        self.clear_checkpoint()
+        self.followers_data = RecordStore(self.columns)
+        self.stats = {'processed': 0, 'business': 0, 'verified': 0}
+        self.analytics.reset()
+        self.resume_id = None
+        self.start_new = True
+
+    def load_checkpoint(self):
+        for _ in range(self.max_retries):
+            try:
+                if self.state:
+                    if not self.state.exists():
+                        return False
+                    self.followers_data, self.processed_ids, self.resume_id = self.state.load()
+                    self.unsaved_records = []
+                    self.unsaved_accounts = {}
+                    self.analytics.reset()
+                    self.analytics.add_store(self.followers_data)
+                    logging.info(f"Loaded state db: {len(self.processed_ids)} followers processed")
+                    return True
+                if self.journal:
+                    if not self.journal.exists():
+                        return False
+                    self.followers_data, self.processed_ids, self.resume_id = self.journal.replay(self.columns)
+                    self.unsaved_records = []
+                    self.unsaved_accounts = {}
+                    self.analytics.reset()
+                    self.analytics.add_store(self.followers_data)
+                    logging.info(f"Replayed checkpoint journal: {len(self.processed_ids)} followers processed")
+                    return True
+                if os.path.exists(self.checkpoint_file):
+                    with open(self.checkpoint_file, 'r') as f:
+                        checkpoint = json.load(f)
+                    self.followers_data = RecordStore.from_checkpoint(self.columns, checkpoint)
+                    if 'processed_ids' in checkpoint:
+                        self.processed_ids = IdIndex.from_ids(checkpoint['processed_ids'], self.id_index_file)
+                    else:
+                        self.processed_ids = IdIndex.load(self.id_index_file)
+                        # The index is saved after the checkpoint, so a crash in between leaves it behind the rows
+                        repaired = self.processed_ids.add_many(self.followers_data.follower_ids)
+                        if repaired:
+                            logging.warning(f"Restored {repaired} checkpointed follower ids missing from {self.id_index_file}")
+                    self.resume_id = checkpoint.get('resume_id')
+                    self.unsaved_records = []
+                    self.unsaved_accounts = {}
+                    self.analytics.reset()
+                    self.analytics.add_store(self.followers_data)
+                    logging.info(f"Loaded checkpoint: {len(self.processed_ids)} followers processed")
+                    return True
+                return False
+            except Exception as e:
+                logging.error(f"Checkpoint load error: {e}")
+                time.sleep(1)
+        logging.error("Failed to load checkpoint after retries")
+        return False
+
+    def save_checkpoint(self, last_id=None, force=False):
+        # Only writes are timed, so the per-batch calls skipped by the throttle stay out of the histogram
+        if force or (time.time() - getattr(self, 'last_checkpoint', 0) > 60):
+            self.write_checkpoint(last_id)
+
+    @timed('save_checkpoint')
+    def write_checkpoint(self, last_id=None):
+        if self.profiler:
+            self.profiler.snapshot(f"checkpoint at {len(self.processed_ids)} processed")
+        if self.state:
+            self.save_state_checkpoint(last_id)
+            return
+        if self.journal:
+            self.save_journal_checkpoint(last_id)
+            return
+        checkpoint = {
+            'followers_columns': self.followers_data.to_columns(),
+            'resume_id': last_id,
+            'timestamp': datetime.now().isoformat()
+        }
+        for _ in range(self.max_retries):
+            try:
+                with open(self.checkpoint_file + '.tmp', 'w') as f:
+                    json.dump(checkpoint, f)
+                os.replace(self.checkpoint_file + '.tmp', self.checkpoint_file)
+                self.processed_ids.save()
+                self.unsaved_records = []
+                self.unsaved_accounts = {}
+                self.last_checkpoint = time.time()
+                logging.info(f"Checkpoint saved: {len(self.processed_ids)} processed")
+                return
+            except Exception as e:
+                logging.error(f"Checkpoint save error: {e}")
+                time.sleep(1)
+        logging.error("Failed to save checkpoint after retries")
+
+    def save_state_checkpoint(self, last_id=None):
+        for _ in range(self.max_retries):
+            try:
+                self.state.commit(self.unsaved_records, last_id, self.unsaved_accounts)
+                self.unsaved_records = []
+                self.unsaved_accounts = {}
+                self.last_checkpoint = time.time()
+                logging.info(f"State db committed: {len(self.processed_ids)} processed")
+                return
+            except Exception as e:
+                logging.error(f"State db commit error: {e}")
+                time.sleep(1)
+        logging.error("Failed to commit state db after retries")
+
+    def save_journal_checkpoint(self, last_id=None):
+        for _ in range(self.max_retries):
+            try:
+                self.journal.append(self.unsaved_records, last_id, self.unsaved_accounts)
+                self.unsaved_records = []
+                self.unsaved_accounts = {}
+                if self.journal.needs_compaction():
+                    self.journal.compact(self.followers_data, self.processed_ids, last_id)
+                    logging.info(f"Checkpoint journal compacted: {len(self.processed_ids)} processed")
+                self.last_checkpoint = time.time()
+                logging.info(f"Checkpoint journaled: {len(self.processed_ids)} processed")
+                return
+            except Exception as e:
+                logging.error(f"Checkpoint journal error: {e}")
+                time.sleep(1)
+        logging.error("Failed to journal checkpoint after retries")
+
+    def validate_email(self, email):
+        return bool(EMAIL_VALID_RE.match(email))
+
+    def validate_phone(self, phone):
+        return bool(PHONE_VALID_RE.match(phone))
+
+    @timed('extract')
+    def extract_data(self, follower, account):
+        return extract_record(follower.username, follower.biography, follower.external_url, follower.full_name,
+                              follower.followers, follower.is_business_account, follower.is_verified, account)
+
+    def extract_batch(self, df, account=None):
+        return extract_batch(df, self.columns, account)
+
+    @timed('filter')
+    def passes_filters(self, follower, min_followers, business_only, non_business_only, verified_only, location_filter):
+        if min_followers and follower.followers < min_followers:
+            return False
+        if business_only and not follower.is_business_account:
+            return False
+        if non_business_only and follower.is_business_account:
+            return False
+        if verified_only and not follower.is_verified:
+            return False
+        if location_filter and location_filter.lower() not in follower.biography.lower():
+            return False
+        return True
+
+    def raw_fields(self, follower, account):
+        return (follower.username, follower.biography, follower.external_url, follower.full_name,
+                follower.followers, follower.is_business_account, follower.is_verified, account)
+
+    def process_follower(self, follower, account, min_followers, business_only, non_business_only, verified_only, location_filter):
+        if not self.passes_filters(follower, min_followers, business_only, non_business_only, verified_only, location_filter):
+            return None
+        with self.metrics.time('cache_get'):
+            cached = self.cache.get(follower.username)
+        if cached is not None:
+            return cached_record(cached)
+        for attempt in range(self.max_retries):
+            try:
+                raw = self.raw_fields(follower, account)
+                with self.metrics.time('extract'):
+                    data = extract_record(*raw)
+                with self.metrics.time('cache_put'):
+                    self.cache.put(follower.username, cache_entry(raw, data))
+                return data
+            except Exception as e:
+                logging.error(f"Error processing {follower.username}, attempt {attempt + 1}: {e}")
+                time.sleep(random.uniform(5, 10))
+        logging.error(f"Failed to process {follower.username} after {self.max_retries} attempts")
+        return None
+
+    def prepare_follower(self, follower, account, min_followers, business_only, non_business_only, verified_only, location_filter):
+        # I/O half of process_follower: filters, cache lookup and reading the profile fields
+        if not self.passes_filters(follower, min_followers, business_only, non_business_only, verified_only, location_filter):
+            return None, None
+        with self.metrics.time('cache_get'):
+            cached = self.cache.get(follower.username)
+        if cached is not None:
+            return cached_record(cached), None
+        for attempt in range(self.max_retries):
+            try:
+                return None, self.raw_fields(follower, account)
+            except Exception as e:
+                logging.error(f"Error reading {follower.username}, attempt {attempt + 1}: {e}")
+                time.sleep(random.uniform(5, 10))
+        logging.error(f"Failed to read {follower.username} after {self.max_retries} attempts")
+        return None, None
+
+    def extraction_pool(self):
+        if self.extract_workers:
+            # Forking would copy the cache flusher and I/O threads' locks mid-use into the workers
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            return ProcessPoolExecutor(max_workers=self.extract_workers, mp_context=multiprocessing.get_context(method))
+        return nullcontext()
+
+    def process_batch(self, batch, account, executor, pool, min_followers, business_only, non_business_only, verified_only, location_filter):
+        filters = (min_followers, business_only, non_business_only, verified_only, location_filter)
+        if pool is None:
+            return list(executor.map(lambda f: self.process_follower(f, account, *filters), batch))
+        prepared = list(executor.map(lambda f: self.prepare_follower(f, account, *filters), batch))
+        results = [data for data, _ in prepared]
+        misses = [i for i, (_, raw) in enumerate(prepared) if raw]
+        if misses:
+            raws = [prepared[i][1] for i in misses]
+            try:
+                with self.metrics.time('extract_pool'):
+                    # At most one task per worker, so a batch pays the IPC round trip once per process
+                    chunksize = max(self.chunk_size, -(-len(raws) // self.extract_workers))
+                    extracted = list(pool.map(extract_record, *zip(*raws), chunksize=chunksize))
+            except Exception as e:
+                logging.error(f"Extraction pool failed, extracting in-process: {e}")
+                extracted = [extract_record(*raw) for raw in raws]
+            for i, raw, data in zip(misses, raws, extracted):
+                with self.metrics.time('cache_put'):
+                    self.cache.put(batch[i].username, cache_entry(raw, data))
+                results[i] = data
+        return results
+
+    def record_follower(self, userid, data):
+        self.followers_data.append(data, userid)
+        self.processed_ids.add(userid)
+        self.unsaved_records.append((userid, data))
+
+    def link_account(self, userid, account):
+        row = self.followers_data.find(userid)
+        if row is None:
+            return None
+        accounts = self.followers_data.get(row, 'accounts') or self.followers_data.get(row, 'account')
+        if account in accounts.split(ACCOUNT_SEPARATOR):
+            return None
+        accounts = f"{accounts}{ACCOUNT_SEPARATOR}{account}"
+        self.followers_data.set_label(row, 'accounts', accounts)
+        self.unsaved_accounts[userid] = accounts
+        return row
+
+    def account_overlaps(self):
+        totals, overlaps = {}, {}
+        for label, count in self.followers_data.label_counts('accounts').items():
+            accounts = label.split(ACCOUNT_SEPARATOR) if label else []
+            for i, a in enumerate(accounts):
+                totals[a] = totals.get(a, 0) + count
+                for b in accounts[i + 1:]:
+                    pair = " & ".join(sorted((a, b)))
+                    overlaps[pair] = overlaps.get(pair, 0) + count
+        return totals, overlaps
+
+    def update_stats(self, data):
+        self.analytics.add(data)
+        if time.time() - self.last_stats_write >= 5:
+            self.write_stats()
+        self.stats['processed'] += 1
+        if data['is_business'] == 'True':
+            self.stats['business'] += 1
+        if data['is_verified'] == 'True':
+            self.stats['verified'] += 1
+        if self.gui:
+            self.gui.set_stats(self.stats)
+        else:
+            sys.stdout.write(f"\rLive Stats: Processed={self.stats['processed']}, Business={self.stats['business']}, Verified={self.stats['verified']}")
+            sys.stdout.flush()
+
+    def write_stats(self):
+        snapshot = dict(self.analytics.snapshot(), run=dict(self.stats))
+        if len(self.usernames) > 1:
+            snapshot['accounts'], snapshot['overlaps'] = self.account_overlaps()
+        try:
+            with open(self.stats_file + '.tmp', 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(self.stats_file + '.tmp', self.stats_file)
+        except OSError as e:
+            logging.error(f"Stats write error: {e}")
+        self.last_stats_write = time.time()
+        return snapshot
+
+    def collect_metrics(self):
+        for name, value in self.cache.stats().items():
+            self.metrics.set(f"cache_{name}", value)
+        self.metrics.set('followers_total', len(self.followers_data))
+        self.metrics.set('followers_processed_run', self.stats['processed'])
+        self.metrics.set('processed_ids', len(self.processed_ids))
+
+    def profiling(self, enabled=True):
+        self.profiler = RunProfiler(self.usernames[0]) if enabled else None
+        return self.profiler or nullcontext()
+
+    def export_metrics(self):
+        try:
+            self.metrics.write(f"{self.metrics_file}.prom", f"{self.metrics_file}.json")
+            logging.info(f"Metrics written to {self.metrics_file}.prom and {self.metrics_file}.json")
+        except OSError as e:
+            logging.error(f"Metrics write error: {e}")
+
+    def get_dynamic_batch_size(self):
+        if not self.valid_proxies:
+            return 10
+        avg_latency = sum(self.proxy_stats[p]['latency'] for p in self.valid_proxies) / len(self.valid_proxies)
+        return max(5, min(20, int(10 / (avg_latency + 0.1))))
+
+    def output_path(self, format, db_file=None):
+        if format == "sqlite":
+            return db_file or self.output_file.replace(".csv", ".db")
+        if format == "csv":
+            return self.output_file
+        return self.output_file.replace(".csv", f".{format}")
+
+    def open_sink(self, store=None):
+        self.close_sink()
+        self.streamed = None
+        path = self.output_path(self.output_format, self.db_file)
+        self.sink = open_sink(self.output_format, path, self.output_columns or self.columns, self.flush_interval,
+                              self.shard_rows, self.shard_bytes, self.compression)
+        if self.sink is None:
+            logging.warning(f"Cannot stream {self.output_format} output to {path}; writing it at the end of the run")
+            return
+        if store:
+            self.sink.write_store(store)
+        logging.info(f"Streaming {self.output_format} output to {path}")
+
+    def close_sink(self):
+        if not self.sink:
+            return
+        self.sink.close()
+        if self.sink.stale:
+            # Rows already appended to a csv/jsonl stream gained accounts; save_results rewrites the file
+            self.streamed = None
+            logging.info(f"{self.sink.path} has rows with outdated accounts; rewriting it")
+        else:
+            self.streamed = (self.output_format, tuple(self.output_columns or self.columns), self.sink.path)
+            logging.info(f"Saved {self.sink.rows} followers to {self.sink.path} in {self.output_format} format")
+        self.sink = None
+
+    def scrape_followers(self, min_followers=None, business_only=False, non_business_only=False, 
+                         verified_only=False, location_filter=None, dry_run=False):
+        from tqdm import tqdm
+        if self.has_checkpoint() and not hasattr(self, 'start_new') and not self.gui:
+            choice = input(f"Checkpoint exists. Resume (r), Start new (n), or Edit settings (e)? ").lower()
+            if choice == 'e':
+                self.edit_settings()
+            self.start_new = choice != 'r'
+            if self.start_new:
+                self.clear_checkpoint()
+                logging.info("Starting fresh - deleted checkpoint")
+        resume = self.load_checkpoint() if not getattr(self, 'start_new', False) else False
+        
+        total_processed = len(self.followers_data) if resume else 0
+        if self.stream and not dry_run:
+            self.open_sink(self.followers_data)
+        try:
+            for account in self.usernames:
+                logging.info(f"Scraping followers for {account}")
+                profile = self.source.Profile.from_username(self.L.context, account)
+                # Followers are consumed a batch at a time as the iterator pages them in; the
+                # profile's follower count only sizes the progress bar
+                followers = profile.get_followers()
+                if self.max_followers:
+                    followers = islice(followers, self.max_followers)
+                total = min(self.max_followers or profile.followers, profile.followers)
+                
+                batch_size = self.get_dynamic_batch_size()
+                with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 2),
+                                        initializer=self.profiler.profile_thread if self.profiler else None) as executor, self.extraction_pool() as pool:
+                    if self.gui:
+                        self.gui.set_progress(0, total)
+                        self.gui.set_status("Scraping")
+                    with tqdm(total=total, desc=f"Scraping {account}", unit="follower", disable=bool(self.gui)) as pbar:
+                        for batch in iter_chunks(followers, batch_size):
+                            if self.paused and not self.stopped:
+                                self.pause()
+                            if self.stopped:
+                                return
+                            seen = self.processed_ids.contains_many([f.userid for f in batch])
+                            fresh, relinked = [], []
+                            for follower, done in zip(batch, seen):
+                                if not done:
+                                    fresh.append(follower)
+                                    continue
+                                if self.followers_data.unlinked:
+                                    self.followers_data.link_id(follower.username, follower.userid)
+                                if len(self.usernames) > 1:
+                                    row = self.link_account(follower.userid, account)
+                                    if row is not None:
+                                        relinked.append(row)
+                            results = self.process_batch(fresh, account, executor, pool, min_followers, business_only,
+                                                         non_business_only, verified_only, location_filter)
+                            
+                            new_records = []
+                            for follower, data in zip(fresh, results):
+                                if data and follower.userid not in self.processed_ids:
+                                    # A cache hit carries the account of the run that first cached it
+                                    if data.get('account') != account or data.get('accounts') != account:
+                                        data = dict(data, account=account, accounts=account)
+                                    self.record_follower(follower.userid, data)
+                                    new_records.append(data)
+                                    self.update_stats(data)
+                                    total_processed += 1
+                                    if self.gui:
+                                        self.gui.set_progress(total_processed)
+                                    else:
+                                        pbar.update(1)
+                            if self.sink:
+                                self.sink.write(new_records)
+                                self.sink.update([self.followers_data.record(row) for row in relinked])
+                            
+                            if len(self.followers_data) % 10 == 0:
+                                logging.info(f"Processed {len(self.followers_data)} followers")
+                                self.save_checkpoint(batch[-1].userid)
+                            
+                            if self.max_followers and total_processed >= self.max_followers:
+                                break
+                            
+                            self.set_proxy()
+                            if not getattr(self.source, 'offline', False):
+                                self.L.context.rate_controller.wait_before_query()
+        finally:
+            self.close_sink()
+
+        self.cache.flush()
+        logging.info(f"Cache stats: {self.cache.stats()}")
+        if not dry_run:
+            self.save_checkpoint(force=True)
+            self.save_results(format=self.output_format, columns=self.output_columns, db_file=self.db_file)
+            if self.snapshots:
+                self.save_snapshot()
+            self.generate_analytics()
+            self.send_notification()
+            if self.gui:
+                self.gui.set_status("Completed")
+        else:
+            logging.info(f"Dry run complete. Processed {len(self.followers_data)} followers without saving.")
+            if self.gui:
+                self.gui.set_status("Dry Run Completed")
+        self.export_metrics()
+
+    @timed('save_snapshot')
+    def save_snapshot(self):
+        path = self.snapshots.write(self.followers_data)
+        logging.info(f"Saved snapshot of {len(self.followers_data)} followers to {path}")
+        return path
+
+    def reextract(self, format="csv", columns=None, db_file=None, chunk_size=10000):
+        # Keep each follower's accounts from the run; the cache only knows the first account
+        if self.state and self.state.exists():
+            # The state db is read in batches rather than loaded whole
+            source = ((d['accounts'], self.cache.get(d['username']) or d) for d in self.state.iter_records(chunk_size))
+            logging.info(f"Re-extracting the followers in {self.state.db_file} from the cache")
+        elif self.load_checkpoint():
+            source = ((d['accounts'], self.cache.get(d['username']) or d) for d in self.followers_data.records())
+            logging.info(f"Re-extracting {len(self.followers_data)} checkpointed followers from the cache")
+        else:
+            source = ((None, entry) for _, entry in self.cache.backend.iter_items())
+            logging.info(f"No checkpoint found; re-extracting every entry in {self.cache_file}")
+        self.analytics.reset()
+        self.output_format, self.output_columns, self.db_file = format, columns, db_file
+        if format in SINKS:
+            self.open_sink()
+        # A streamed output already holds every row, so only the accounts are kept for the overlap stats
+        records = RecordStore(['accounts'] if self.sink else self.columns)
+        with self.extraction_pool() as pool:
+            for chunk in iter_chunks(source, chunk_size):
+                entries = [entry for _, entry in chunk]
+                if pool is None:
+                    extracted = list(map(reextract_entry, entries))
+                else:
+                    extracted = list(pool.map(reextract_entry, entries, chunksize=max(self.chunk_size, len(entries) // (4 * self.extract_workers))))
+                for (accounts, _), record in zip(chunk, extracted):
+                    if accounts:
+                        record['accounts'] = accounts
+                        record['account'] = accounts.split(ACCOUNT_SEPARATOR)[0]
+                if self.sink:
+                    self.sink.write(extracted)
+                records.extend(extracted)
+                for record in extracted:
+                    self.analytics.add(record)
+                logging.info(f"Re-extracted {len(records)} followers")
+        self.close_sink()
+        self.followers_data = records
+        self.save_results(format=format, columns=columns, db_file=db_file)
+        self.generate_analytics()
+        self.export_metrics()
+
+    def edit_settings(self):
+        if not self.gui:
+            print(f"Current settings: max_followers={self.max_followers}, proxies={self.proxies}")
+            self.max_followers = int(input("Max followers (enter to keep): ") or self.max_followers)
+            self.min_followers = int(input("Min followers (enter to keep): ") or getattr(self, 'min_followers', 0))
+            self.business_only = input("Business only (y/n, enter to keep): ").lower() == 'y' or getattr(self, 'business_only', False)
+            self.verified_only = input("Verified only (y/n, enter to keep): ").lower() == 'y' or getattr(self, 'verified_only', False)
+            self.location_filter = input("Location filter (enter to keep): ") or getattr(self, 'location_filter', None)
+
+    @timed('save_results')
+    def save_results(self, format="csv", columns=None, db_file=None):
+        if not self.followers_data:
+            return
+        path = self.output_path(format, db_file)
+        if self.streamed == (format, tuple(columns or self.columns), path):
+            logging.info(f"{path} was streamed during the run; nothing left to write")
+            return
+        if format == "sqlite":
+            sink = SQLiteSink(path, columns or self.columns)
+            if self.state:
+                self.state.commit(self.unsaved_records, self.resume_id, self.unsaved_accounts)
+                self.unsaved_records = []
+                self.unsaved_accounts = {}
+                count = self.state.export(sink)
+                sink.close()
+                logging.info(f"Upserted {count} followers into {path} from state db")
+            else:
+                sink.write_store(self.followers_data)
+                sink.close()
+                logging.info(f"Upserted {sink.rows} followers into {path}")
+            return
+        if format in ShardedSink.FORMATS and (self.shard_rows or self.shard_bytes):
+            sink = open_sink(format, path, columns or self.columns, self.flush_interval, self.shard_rows,
+                             self.shard_bytes, self.compression)
+            sink.write_store(self.followers_data)
+            sink.close()
+            logging.info(f"Saved {sink.rows} followers to {len(sink.shards)} {format} shards listed in {sink.manifest_path}")
+            return
+        if format in ("parquet", "feather"):
+            count = write_arrow(self.followers_data, columns or self.columns, path, format)
+            logging.info(f"Saved {count} followers to {path} in {format} format")
+            return
+        df = self.followers_data.to_frame(columns)
+        if format == "csv":
+            df.to_csv(path, index=False)
+        elif format == "json":
+            df.to_json(path, orient="records")
+        elif format == "jsonl":
+            df.to_json(path, orient="records", lines=True, force_ascii=False)
+        logging.info(f"Saved {len(df)} followers to {path} in {format} format")
+
+    @timed('generate_analytics')
+    def generate_analytics(self):
+        if not self.analytics.count:
+            logging.info("No data for analytics")
+            return
+        snapshot = self.write_stats()
+        total = snapshot['total']
+        success_rate = (total / (total + len(self.processed_ids) - total)) * 100 if total > 0 and self.processed_ids else 0
+        analytics_text = f"{StreamingAnalytics.describe(snapshot)}\nSuccess Rate={success_rate:.2f}%"
+        if len(self.usernames) > 1:
+            totals, overlaps = self.account_overlaps()
+            analytics_text += f"\nFollowers per Account: {totals}\nAccount Overlap: {overlaps}"
+        logging.info(analytics_text)
+        if self.gui:
+            self.gui.log(analytics_text)
+
+    def send_notification(self):
+        if not self.email_config:
+            return
+        from .notification import send_completion_email
+        send_completion_email(self.email_config, self.usernames, len(self.followers_data))
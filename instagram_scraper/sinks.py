@@ -0,0 +1,277 @@
+import csv
+import glob
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+
+from .schema import ARROW_COLUMN_TYPES, SQLITE_COLUMN_TYPES
+from .state import StateStore
+
+def arrow_table(records, columns):
+    import pyarrow as pa
+    arrays = []
+    for column in columns:
+        values = records.column(column)
+        kind = ARROW_COLUMN_TYPES.get(column, 'string')
+        if kind == 'bool':
+            arrays.append(pa.array([v == 'True' if isinstance(v, str) else v for v in values], type=pa.bool_()))
+        elif kind == 'category':
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        elif kind == 'string':
+            arrays.append(pa.array(values, type=pa.string()))
+        else:
+            arrays.append(pa.array([None if v in ("", None) else v for v in values], type=getattr(pa, kind)()))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+def write_arrow(records, columns, path, format):
+    table = arrow_table(records, columns)
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path, compression='zstd')
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path, compression='zstd')
+    return table.num_rows
+
+class OutputSink:
+    def __init__(self, path, columns, flush_interval=5.0):
+        self.path = path
+        self.columns = columns
+        self.flush_interval = flush_interval
+        self.rows = 0
+        self.stale = False
+        self.last_flush = time.time()
+
+    def rows_for(self, records):
+        return [[r.get(c) for c in self.columns] for r in records]
+
+    def write(self, records):
+        if not records:
+            return
+        self.write_rows(self.rows_for(records))
+        self.rows += len(records)
+        if time.time() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def update(self, records):
+        # Append-only sinks cannot rewrite a row in place
+        if records and 'accounts' in self.columns:
+            self.stale = True
+
+    def write_store(self, store, chunk_size=10000):
+        for start in range(0, len(store), chunk_size):
+            self.write_rows(list(store.rows(self.columns, start, start + chunk_size)))
+        self.rows += len(store)
+        self.flush()
+
+    def flush(self):
+        self.last_flush = time.time()
+
+class CSVSink(OutputSink):
+    def __init__(self, path, columns, flush_interval=5.0):
+        super().__init__(path, columns, flush_interval)
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file, lineterminator='\n')
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def flush(self):
+        self.file.flush()
+        super().flush()
+
+    def close(self):
+        self.file.close()
+
+class JSONLinesSink(OutputSink):
+    def __init__(self, path, columns, flush_interval=5.0):
+        super().__init__(path, columns, flush_interval)
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_rows(self, rows):
+        self.file.writelines(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n" for row in rows)
+
+    def flush(self):
+        self.file.flush()
+        super().flush()
+
+    def close(self):
+        self.file.close()
+
+class SQLiteSink(OutputSink):
+    KEY = ('account', 'username')
+    INDEXED = ('account', 'is_business', 'followers_count')
+
+    def __init__(self, path, columns, flush_interval=5.0):
+        columns = [c for c in self.KEY if c not in columns] + list(columns)
+        super().__init__(path, columns, flush_interval)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY", "cache_size=-65536"):
+            self.conn.execute(f"PRAGMA {pragma}")
+        with self.conn:
+            self.create_schema()
+        quoted = StateStore.quoted(columns)
+        updates = ", ".join(f'"{c}" = excluded."{c}"' for c in columns if c not in self.KEY)
+        self.upsert_clause = (f"ON CONFLICT ({StateStore.quoted(self.KEY)}) "
+                              + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING"))
+        self.insert_sql = f"INSERT INTO followers ({quoted}) VALUES ({', '.join('?' * len(columns))}) {self.upsert_clause}"
+
+    def create_schema(self):
+        info = self.conn.execute("PRAGMA table_info(followers)").fetchall()
+        existing = [row[1] for row in info]
+        keyed = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]] == list(self.KEY)
+        if existing and not keyed:
+            # Tables written by the old to_sql path have no primary key; move their rows over once
+            self.conn.execute("ALTER TABLE followers RENAME TO followers_unkeyed")
+        table_columns = self.columns + [c for c in existing if c not in self.columns]
+        if not existing or not keyed:
+            column_defs = ", ".join(f'"{c}" {SQLITE_COLUMN_TYPES.get(c, "")}'.rstrip() for c in table_columns)
+            self.conn.execute(f"CREATE TABLE followers ({column_defs}, PRIMARY KEY ({StateStore.quoted(self.KEY)}))")
+        else:
+            for c in self.columns:
+                if c not in existing:
+                    self.conn.execute(f'ALTER TABLE followers ADD COLUMN "{c}" {SQLITE_COLUMN_TYPES.get(c, "")}'.rstrip())
+        if existing and not keyed:
+            shared = StateStore.quoted([c for c in existing if c in table_columns])
+            self.conn.execute(f"INSERT OR REPLACE INTO followers ({shared}) SELECT {shared} FROM followers_unkeyed")
+            self.conn.execute("DROP TABLE followers_unkeyed")
+        for c in self.INDEXED:
+            if c in table_columns:
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_followers_{c}" ON followers ("{c}")')
+
+    def write_rows(self, rows):
+        self.conn.executemany(self.insert_sql, rows)
+
+    def update(self, records):
+        if records:
+            self.write_rows(self.rows_for(records))
+
+    def flush(self):
+        self.conn.commit()
+        super().flush()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+class HashingWriter(io.RawIOBase):
+    # Counts and checksums the compressed bytes on their way to disk
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self.file.write(data)
+
+    def flush(self):
+        if not self.file.closed:
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+class ShardedSink(OutputSink):
+    # Rotating csv/jsonl shards of at most shard_rows rows or about shard_bytes compressed bytes.
+    # The manifest is rewritten as each shard closes and only lists finished shards, so a failed
+    # write loses at most the shard being written. Every csv shard has its own header.
+    FORMATS = ('csv', 'jsonl')
+    EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+    CHECK_ROWS = 1000
+
+    def __init__(self, path, columns, flush_interval=5.0, format='csv', shard_rows=None, shard_bytes=None,
+                 compression='gzip'):
+        super().__init__(path, columns, flush_interval)
+        self.format = format
+        self.shard_rows = shard_rows
+        self.shard_bytes = shard_bytes
+        self.compression = compression
+        self.stem, ext = os.path.splitext(path)
+        self.suffix = f"{ext or '.' + format}{self.EXTENSIONS[compression]}"
+        self.manifest_path = f"{path}.manifest.json"
+        # Shards of an earlier write would otherwise outlive a shorter rewrite
+        for old in glob.glob(f"{glob.escape(self.stem)}.[0-9][0-9][0-9][0-9][0-9]{glob.escape(self.suffix)}"):
+            os.remove(old)
+        self.shards = []
+        self.raw = self.text = None
+        self.shard_count = 0
+        self.write_manifest(complete=False)
+
+    def open_shard(self):
+        path = f"{self.stem}.{len(self.shards):05d}{self.suffix}"
+        self.raw = HashingWriter(path)
+        if self.compression == "gzip":
+            stream = gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=6, mtime=0)
+        elif self.compression == "zstd":
+            import pyarrow as pa
+            stream = pa.CompressedOutputStream(pa.PythonFile(self.raw, mode='w'), 'zstd')
+        else:
+            stream = io.BufferedWriter(self.raw)
+        self.text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        if self.format == "csv":
+            self.writer = csv.writer(self.text, lineterminator='\n')
+            self.writer.writerow(self.columns)
+        self.shard_count = 0
+
+    def close_shard(self):
+        self.text.close()
+        if not self.raw.closed:
+            self.raw.close()
+        self.shards.append({'file': os.path.basename(self.raw.file.name), 'rows': self.shard_count,
+                            'bytes': self.raw.size, 'sha256': self.raw.sha256.hexdigest()})
+        self.raw = self.text = None
+        self.write_manifest(complete=False)
+
+    def write_manifest(self, complete):
+        manifest = {'format': self.format, 'compression': self.compression, 'columns': list(self.columns),
+                    'rows': sum(shard['rows'] for shard in self.shards), 'complete': complete, 'shards': self.shards}
+        with open(f"{self.manifest_path}.tmp", 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+    def write_rows(self, rows):
+        while rows:
+            if self.text is None:
+                self.open_shard()
+            room = self.shard_rows - self.shard_count if self.shard_rows else len(rows)
+            if self.shard_bytes:
+                room = min(room, self.CHECK_ROWS)
+            part, rows = rows[:room], rows[room:]
+            if self.format == "csv":
+                self.writer.writerows(part)
+            else:
+                self.text.writelines(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + "\n" for row in part)
+            self.shard_count += len(part)
+            if (self.shard_rows and self.shard_count >= self.shard_rows) or \
+                    (self.shard_bytes and self.raw.size >= self.shard_bytes):
+                self.close_shard()
+
+    def flush(self):
+        if self.text:
+            self.text.flush()
+        super().flush()
+
+    def close(self):
+        if self.text:
+            self.close_shard()
+        self.write_manifest(complete=True)
+
+SINKS = {'csv': CSVSink, 'jsonl': JSONLinesSink, 'sqlite': SQLiteSink}
+
+def open_sink(format, path, columns, flush_interval=5.0, shard_rows=None, shard_bytes=None, compression='gzip'):
+    if format not in SINKS or not path:
+        return None
+    if (shard_rows or shard_bytes) and format in ShardedSink.FORMATS:
+        return ShardedSink(path, columns, flush_interval, format, shard_rows, shard_bytes, compression)
+    return SINKS[format](path, columns, flush_interval)
@@ -0,0 +1,105 @@
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime
+
+from .schema import ACCOUNT_SEPARATOR
+
+MANIFEST = "manifest.json"
+ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+def partition_file(i):
+    return f"part-{i:03d}.tsv.gz"
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST), 'r') as f:
+        return json.load(f)
+
+def read_partition(path, i):
+    # Lines are "account<TAB>key<TAB>values", where values is the record's JSON list in manifest
+    # column order; JSON escapes any tab or newline inside a field. A partition is small enough to
+    # decompress in one go, which is much faster than reading it line by line.
+    with open(os.path.join(path, partition_file(i)), 'rb') as f:
+        text = gzip.decompress(f.read()).decode('utf-8')
+    for line in text.split('\n')[:-1]:
+        account, key, values = line.split('\t', 2)
+        yield (account, key), values
+
+class SnapshotStore:
+    # One directory per completed run under `root`. Rows are per (account, follower id) and
+    # hash-partitioned on that key, so a diff only ever holds one partition of one snapshot in memory.
+    PARTITIONS = 64
+    ACCOUNT_FIELDS = ('account', 'accounts')
+
+    def __init__(self, root, partitions=PARTITIONS):
+        self.root = root
+        self.partitions = partitions
+
+    def snapshots(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.path.join(self.root, name) for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, MANIFEST)))
+
+    def write(self, store, chunk_size=100000):
+        name = datetime.now().strftime('%Y%m%d-%H%M%S')
+        path, n = os.path.join(self.root, name), 1
+        while os.path.exists(path):
+            path, n = os.path.join(self.root, f"{name}-{n}"), n + 1
+        # Written under a temporary name, so a run that dies mid-write leaves no half snapshot
+        tmp = f"{path}.tmp"
+        os.makedirs(tmp)
+        columns = [c for c in store.columns if c not in self.ACCOUNT_FIELDS]
+        ids = store.follower_ids if len(store.follower_ids) == len(store) and not store.unlinked else None
+        username = columns.index('username')
+        counts = {}
+        files = [gzip.open(os.path.join(tmp, partition_file(i)), 'wt', encoding='utf-8', compresslevel=1)
+                 for i in range(self.partitions)]
+        try:
+            for start in range(0, len(store), chunk_size):
+                rows = store.rows(['accounts', 'account', *columns], start, start + chunk_size)
+                lines = [[] for _ in files]
+                for row, (accounts, first, *values) in enumerate(rows, start):
+                    key = ids[row] if ids is not None else values[username]
+                    text = ENCODER.encode(values)
+                    for account in (accounts or first).split(ACCOUNT_SEPARATOR):
+                        head = f"{account}\t{key}"
+                        lines[zlib.crc32(head.encode('utf-8')) % self.partitions].append(f"{head}\t{text}\n")
+                        counts[account] = counts.get(account, 0) + 1
+                for f, part in zip(files, lines):
+                    f.writelines(part)
+        finally:
+            for f in files:
+                f.close()
+        with open(os.path.join(tmp, MANIFEST), 'w') as f:
+            json.dump({'created': datetime.now().isoformat(), 'columns': columns, 'partitions': self.partitions,
+                       'key': 'follower_id' if ids is not None else 'username', 'rows': sum(counts.values()),
+                       'accounts': counts}, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+def changed_fields(before, after):
+    return {c: [before.get(c, ""), after.get(c, "")] for c in dict.fromkeys([*before, *after])
+            if before.get(c, "") != after.get(c, "")}
+
+def diff_snapshots(old, new):
+    # Yields (change, account, key, old record, new record) for each added, removed or changed
+    # follower. Unchanged rows are recognised by their JSON text alone, without parsing.
+    old_manifest, new_manifest = read_manifest(old), read_manifest(new)
+    if old_manifest['partitions'] != new_manifest['partitions'] or old_manifest['key'] != new_manifest['key']:
+        raise ValueError(f"{old} and {new} were written with different keys or partitioning and cannot be compared")
+    old_columns, new_columns = old_manifest['columns'], new_manifest['columns']
+    same_columns = old_columns == new_columns
+    for i in range(new_manifest['partitions']):
+        before = dict(read_partition(old, i))
+        for key, values in read_partition(new, i):
+            previous = before.pop(key, None)
+            if previous is None:
+                yield ('added', *key, None, dict(zip(new_columns, json.loads(values))))
+            elif previous != values or not same_columns:
+                old_record, new_record = dict(zip(old_columns, json.loads(previous))), dict(zip(new_columns, json.loads(values)))
+                if changed_fields(old_record, new_record):
+                    yield ('changed', *key, old_record, new_record)
+        for key, values in before.items():
+            yield ('removed', *key, dict(zip(old_columns, json.loads(values))), None)
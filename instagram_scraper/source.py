@@ -0,0 +1,57 @@
+import json
+import logging
+import random
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+class CustomRateController:
+    def __init__(self, context):
+        self.context = context
+        self.last_request = 0
+        self.retry_after = 0
+    
+    def sleep(self, seconds):
+        wait = max(seconds, self.retry_after - time.time())
+        time.sleep(max(0, wait))
+        self.last_request = time.time()
+
+    def wait_before_query(self):
+        try:
+            response = self.context._session.get('https://www.instagram.com', timeout=10)
+            if response.status_code == 429:
+                self.retry_after = time.time() + int(response.headers.get('Retry-After', 60))
+                logging.warning(f"Rate limit hit. Waiting until {datetime.fromtimestamp(self.retry_after)}")
+                self.sleep(self.retry_after - time.time())
+            else:
+                self.sleep(random.uniform(1.5, 4.0))
+                if random.random() < 0.1:
+                    self.sleep(random.uniform(30, 60))
+        except Exception:
+            self.sleep(random.uniform(5, 10))
+
+class FakeInstaloader:
+    # Stand-in for instaloader that serves followers from a JSON fixture ({account: [follower, ...]})
+    offline = True
+
+    def __init__(self, fixture_file, latency=0.0, page_size=50):
+        with open(fixture_file, 'r') as f:
+            self.accounts = json.load(f)
+        self.latency = latency
+        self.page_size = page_size
+        self.Profile = SimpleNamespace(from_username=self.from_username)
+
+    def from_username(self, context, username):
+        if username not in self.accounts:
+            import instaloader
+            raise instaloader.exceptions.ProfileNotExistsException(f"Profile {username} does not exist.")
+        followers = self.accounts[username]
+        return SimpleNamespace(username=username, followers=len(followers),
+                               get_followers=lambda: self.iter_followers(followers))
+
+    def iter_followers(self, followers):
+        # Followers arrive in pages like the real GraphQL iterator; latency is paid per page
+        for i, follower in enumerate(followers):
+            if self.latency and i % self.page_size == 0:
+                time.sleep(self.latency)
+            yield SimpleNamespace(**follower)
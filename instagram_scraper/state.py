@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from .records import IdIndex, RecordStore
+from .schema import SQLITE_COLUMN_TYPES
+
+class StateStore:
+    def __init__(self, db_file, columns):
+        self.db_file = db_file
+        self.columns = columns
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        column_defs = ", ".join(f'"{c}" {SQLITE_COLUMN_TYPES.get(c, "")}'.rstrip() for c in columns)
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS followers (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                              f"follower_id INTEGER NOT NULL UNIQUE, {column_defs})")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(followers)")}
+            for c in columns:
+                if c not in existing:
+                    self.conn.execute(f'ALTER TABLE followers ADD COLUMN "{c}" {SQLITE_COLUMN_TYPES.get(c, "")}'.rstrip())
+        self.insert_sql = (f"INSERT OR IGNORE INTO followers (follower_id, {self.quoted(columns)}) "
+                           f"VALUES (?, {', '.join('?' * len(columns))})")
+
+    @staticmethod
+    def quoted(columns):
+        return ", ".join(f'"{c}"' for c in columns)
+
+    def exists(self):
+        with self.lock:
+            return self.conn.execute("SELECT EXISTS(SELECT 1 FROM followers) OR EXISTS(SELECT 1 FROM meta)").fetchone()[0] == 1
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM followers")
+            self.conn.execute("DELETE FROM meta")
+
+    def commit(self, records, resume_id=None, accounts=None):
+        rows = [(uid, *(data.get(c) for c in self.columns)) for uid, data in records]
+        with self.lock, self.conn:
+            self.conn.executemany(self.insert_sql, rows)
+            if accounts:
+                self.conn.executemany("UPDATE followers SET accounts = ? WHERE follower_id = ?",
+                                      [(value, uid) for uid, value in accounts.items()])
+            self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                  [('resume_id', json.dumps(resume_id)), ('timestamp', datetime.now().isoformat())])
+
+    def load(self):
+        with self.lock:
+            cursor = self.conn.execute(f"SELECT follower_id, {self.quoted(self.columns)} FROM followers ORDER BY seq")
+            followers_data, ids = RecordStore(self.columns), []
+            for row in cursor:
+                ids.append(row[0])
+                followers_data.append_row(row[1:], row[0])
+            meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        return followers_data, IdIndex.from_ids(ids), json.loads(meta.get('resume_id', 'null'))
+
+    def iter_records(self, batch_size=10000):
+        # Rows in scrape order, a batch at a time, so a run can be read without loading it whole
+        select = f"SELECT seq, {self.quoted(self.columns)} FROM followers WHERE seq > ? ORDER BY seq LIMIT ?"
+        last = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(select, (last, batch_size)).fetchall()
+            if not rows:
+                return
+            for seq, *values in rows:
+                yield dict(zip(self.columns, values))
+            last = rows[-1][0]
+
+    def export(self, sink):
+        # Commit the sink's schema first so the attached database is not locked by its connection
+        sink.flush()
+        columns = self.quoted(sink.columns)
+        with self.lock:
+            self.conn.execute("ATTACH DATABASE ? AS export", (sink.path,))
+            try:
+                with self.conn:
+                    # WHERE true keeps SQLite from parsing ON CONFLICT as a join constraint
+                    cursor = self.conn.execute(f"INSERT INTO export.followers ({columns}) SELECT {columns} FROM main.followers "
+                                               f"WHERE true ORDER BY seq {sink.upsert_clause}")
+                return cursor.rowcount
+            finally:
+                self.conn.execute("DETACH DATABASE export")
+
+class CheckpointJournal:
+    def __init__(self, snapshot_file, journal_file=None, compact_ratio=1.0, min_compact=1000):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file or f"{snapshot_file}.journal"
+        self.id_index_file = f"{snapshot_file}.ids"
+        self.compact_ratio = compact_ratio
+        self.min_compact = min_compact
+        self.snapshot_size = 0
+        self.journal_size = 0
+
+    def exists(self):
+        return os.path.exists(self.snapshot_file) or os.path.exists(self.journal_file)
+
+    def clear(self):
+        for path in (self.snapshot_file, self.journal_file):
+            if os.path.exists(path):
+                os.remove(path)
+        self.snapshot_size = self.journal_size = 0
+
+    def append(self, records, resume_id=None, accounts=None):
+        lines = [json.dumps({'id': uid, 'data': data}) for uid, data in records]
+        lines += [json.dumps({'id': uid, 'accounts': value}) for uid, value in (accounts or {}).items()]
+        lines.append(json.dumps({'resume_id': resume_id, 'timestamp': datetime.now().isoformat()}))
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_size += len(records)
+
+    def needs_compaction(self):
+        return self.journal_size >= max(self.min_compact, self.compact_ratio * self.snapshot_size)
+
+    def compact(self, followers_data, processed_ids, resume_id=None):
+        checkpoint = {
+            'followers_columns': followers_data.to_columns(),
+            'resume_id': resume_id,
+            'timestamp': datetime.now().isoformat()
+        }
+        with open(self.snapshot_file + '.tmp', 'w') as f:
+            json.dump(checkpoint, f)
+        os.replace(self.snapshot_file + '.tmp', self.snapshot_file)
+        processed_ids.save()
+        # A crash before the truncate is harmless: replay skips ids already in the snapshot
+        open(self.journal_file, 'w').close()
+        self.snapshot_size = len(followers_data)
+        self.journal_size = 0
+
+    def replay(self, columns):
+        followers_data, processed_ids, resume_id = RecordStore(columns), IdIndex.load(self.id_index_file), None
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r') as f:
+                checkpoint = json.load(f)
+            followers_data = RecordStore.from_checkpoint(columns, checkpoint)
+            if 'processed_ids' in checkpoint:
+                processed_ids = IdIndex.from_ids(checkpoint['processed_ids'], self.id_index_file)
+            resume_id = checkpoint.get('resume_id')
+            # compact() saves the index after the snapshot; without its rows the journal would add them twice
+            repaired = processed_ids.add_many(followers_data.follower_ids)
+            if repaired:
+                logging.warning(f"Restored {repaired} snapshot follower ids missing from {self.id_index_file}")
+        self.snapshot_size = len(followers_data)
+        self.journal_size = 0
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'r+b') as f:
+                complete = 0
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # A crash mid-append left a partial last line; cut it off so the next append starts clean
+                        logging.warning("Truncating torn checkpoint journal entry")
+                        f.truncate(complete)
+                        break
+                    complete += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logging.warning("Skipping torn checkpoint journal entry")
+                        continue
+                    if 'resume_id' in entry:
+                        resume_id = entry['resume_id']
+                    elif 'accounts' in entry:
+                        row = followers_data.find(entry['id'])
+                        if row is not None:
+                            followers_data.set_label(row, 'accounts', entry['accounts'])
+                    elif entry['id'] not in processed_ids:
+                        followers_data.append(entry['data'], entry['id'])
+                        processed_ids.add(entry['id'])
+                        self.journal_size += 1
+        return followers_data, processed_ids, resume_id